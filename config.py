@@ -13,6 +13,33 @@ class Config:
     # Memory Layer backend
     MEMORY_LAYER_URL = os.getenv("MEMORY_LAYER_URL", "http://localhost:8000")
     MEMORY_LAYER_TIMEOUT = int(os.getenv("MEMORY_LAYER_TIMEOUT", "30"))
+    # HTTP/2 needs TLS (or h2c support on the backend), so default to https only
+    MEMORY_LAYER_HTTP2 = os.getenv(
+        "MEMORY_LAYER_HTTP2",
+        str(MEMORY_LAYER_URL.startswith("https://"))
+    ).lower() == "true"
+    
+    # Retry on 429/503 and optional client-side rate limit (0 disables)
+    MEMORY_LAYER_MAX_RETRIES = int(os.getenv("MEMORY_LAYER_MAX_RETRIES", "5"))
+    MEMORY_LAYER_RATE_LIMIT = float(os.getenv("MEMORY_LAYER_RATE_LIMIT", "0"))
+    MEMORY_LAYER_RATE_PERIOD = float(os.getenv("MEMORY_LAYER_RATE_PERIOD", "1.0"))
+    
+    # HTTP connection pool (httpx)
+    HTTPX_MAX_CONNECTIONS = int(os.getenv("HTTPX_MAX_CONNECTIONS", "256"))
+    HTTPX_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTPX_MAX_KEEPALIVE_CONNECTIONS", "50"))
+    HTTPX_KEEPALIVE_EXPIRY = float(os.getenv("HTTPX_KEEPALIVE_EXPIRY", "15.0"))
+    MAX_INFLIGHT = int(os.getenv("MAX_INFLIGHT", "64"))
+    
+    # Ingest micro-batching (requires /ingest/{text,code,json}/batch on the backend)
+    INGEST_BATCH_ENABLED = os.getenv("INGEST_BATCH_ENABLED", "false").lower() == "true"
+    INGEST_BATCH_MAX_SIZE = int(os.getenv("INGEST_BATCH_MAX_SIZE", "32"))
+    INGEST_BATCH_WINDOW_MS = int(os.getenv("INGEST_BATCH_WINDOW_MS", "10"))
+    
+    # In-process cache for idempotent GETs (TTL in seconds, 0 disables)
+    GET_CACHE_MAXSIZE = int(os.getenv("GET_CACHE_MAXSIZE", "512"))
+    STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "30"))
+    HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+    CACHE_STATS_CACHE_TTL = float(os.getenv("CACHE_STATS_CACHE_TTL", "5"))
     
     # Server settings
     SERVER_NAME = "ZepAI Memory Server"
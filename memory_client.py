@@ -1,13 +1,152 @@
 """
 HTTP Client for Memory Layer backend
 """
+import asyncio
+import hashlib
 import httpx
 import logging
-from typing import Dict, Any, Optional
+import orjson
+import random
+import time
+from aiolimiter import AsyncLimiter
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Hashable, List, Optional, Tuple
 from config import config
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+_JSON_HEADERS = {"content-type": "application/json"}
+_RETRY_STATUSES = {429, 503}
+_MAX_BACKOFF = 30.0
+
+SendFn = Callable[..., Awaitable[Any]]
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying, honouring Retry-After when numeric"""
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), _MAX_BACKOFF)
+        except ValueError:
+            pass
+    return min(2 ** attempt, _MAX_BACKOFF) + random.random()
+
+
+class _TTLCache:
+    """LRU cache with a per-entry time-to-live"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Any:
+        """Return cached value, or _MISSING if absent or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """Store value for ttl seconds, evicting the least recently used entry"""
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def clear(self):
+        self._data.clear()
+
+
+class _IngestBatcher:
+    """Coalesce concurrent ingest calls into a single batch request"""
+    
+    def __init__(self, send: SendFn, path: str, max_size: int, window: float):
+        self.send = send
+        self.path = path
+        self.max_size = max_size
+        self.window = window
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        
+        # Items taken off the queue but not yet resolved (gathering or flushing)
+        self._batch: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+    
+    async def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Enqueue payload and wait for its slot in the batch response"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((payload, future))
+        return await future
+    
+    async def _run(self):
+        """Drain the queue into batches of up to max_size or one window"""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+            self._batch = []
+    
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """POST one batch and resolve each caller's future"""
+        try:
+            data = await self.send(
+                "POST",
+                self.path,
+                {"items": [payload for payload, _ in batch]}
+            )
+            results = data.get("items", []) if isinstance(data, dict) else data
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Batch response has {len(results)} items, expected {len(batch)}"
+                )
+        except Exception as e:
+            logger.warning(f"Batch ingest to {self.path} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def close(self):
+        """Stop the drain task and fail any callers still waiting"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        pending = self._batch
+        self._batch = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("MemoryClient closed"))
+
 
 class MemoryClient:
     """HTTP client for Memory Layer backend"""
@@ -15,15 +154,165 @@ class MemoryClient:
     def __init__(self):
         self.base_url = config.MEMORY_LAYER_URL.rstrip("/")
         self.timeout = config.MEMORY_LAYER_TIMEOUT
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(self.timeout),
-            limits=httpx.Limits(max_connections=20, max_keepalive_connections=5)
+        limits = httpx.Limits(
+            max_connections=config.HTTPX_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTPX_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTPX_KEEPALIVE_EXPIRY
         )
+        if self.base_url.startswith("unix://"):
+            # Same-host backend over a Unix domain socket (no TCP/TLS setup);
+            # the host part of the URL is ignored by the transport
+            transport = httpx.AsyncHTTPTransport(
+                uds=self.base_url[len("unix://"):],
+                limits=limits
+            )
+            self.base_url = "http://localhost"
+            self.client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(self.timeout)
+            )
+        else:
+            self.client = httpx.AsyncClient(
+                http2=config.MEMORY_LAYER_HTTP2,
+                timeout=httpx.Timeout(self.timeout),
+                limits=limits
+            )
+        
+        # Per-endpoint batchers (opt-in, backend must expose /ingest/<kind>/batch)
+        self._batchers: Dict[str, _IngestBatcher] = {}
+        if config.INGEST_BATCH_ENABLED:
+            for kind in ("text", "code", "json"):
+                self._batchers[kind] = _IngestBatcher(
+                    self._request,
+                    f"/ingest/{kind}/batch",
+                    max_size=config.INGEST_BATCH_MAX_SIZE,
+                    window=config.INGEST_BATCH_WINDOW_MS / 1000
+                )
+        
+        # Cache for idempotent GETs; the epoch is part of every key so a fetch
+        # that started before an invalidation can never repopulate fresh keys
+        self._cache = _TTLCache(maxsize=config.GET_CACHE_MAXSIZE)
+        self._cache_fetches: Dict[Hashable, asyncio.Future] = {}
+        self._cache_epoch = 0
+        
+        # Concurrent identical searches share one backend call
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        
+        # Backpressure: cap in-flight backend calls below the connection pool
+        self._sem = asyncio.Semaphore(config.MAX_INFLIGHT)
+        
+        # Optional client-side throttle (requests per period)
+        self._limiter: Optional[AsyncLimiter] = None
+        if config.MEMORY_LAYER_RATE_LIMIT > 0:
+            self._limiter = AsyncLimiter(
+                config.MEMORY_LAYER_RATE_LIMIT,
+                config.MEMORY_LAYER_RATE_PERIOD
+            )
     
     async def close(self):
         """Close HTTP client"""
+        for batcher in self._batchers.values():
+            await batcher.close()
         await self.client.aclose()
     
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> Any:
+        """Send a request and decode the JSON body, retrying on 429/503"""
+        url = f"{self.base_url}{path}"
+        kwargs: Dict[str, Any] = {}
+        if payload is not None:
+            kwargs = {"content": orjson.dumps(payload), "headers": _JSON_HEADERS}
+        
+        for attempt in range(config.MEMORY_LAYER_MAX_RETRIES + 1):
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            try:
+                async with self._sem:
+                    if stream:
+                        async with self.client.stream(method, url, **kwargs) as response:
+                            response.raise_for_status()
+                            body = await response.aread()
+                    else:
+                        response = await self.client.request(method, url, **kwargs)
+                        response.raise_for_status()
+                        body = response.content
+                return orjson.loads(body)
+            except httpx.HTTPStatusError as e:
+                if (e.response.status_code not in _RETRY_STATUSES
+                        or attempt >= config.MEMORY_LAYER_MAX_RETRIES):
+                    raise
+                delay = _retry_delay(e.response, attempt)
+                logger.warning(
+                    f"{method} {path} returned {e.response.status_code}, "
+                    f"retrying in {delay:.1f}s ({attempt + 1}/{config.MEMORY_LAYER_MAX_RETRIES})"
+                )
+                await asyncio.sleep(delay)
+    
+    async def _single_flight(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST payload, joining an identical request that is already in flight"""
+        digest = hashlib.blake2b(
+            orjson.dumps(payload, option=orjson.OPT_SORT_KEYS),
+            digest_size=16
+        ).hexdigest()
+        key = (path, digest)
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request("POST", path, payload, stream=True))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+    
+    async def _ingest(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST to /ingest/<kind>, through the batcher when one is configured"""
+        batcher = self._batchers.get(kind)
+        if batcher is not None:
+            result = await batcher.submit(payload)
+        else:
+            result = await self._request("POST", f"/ingest/{kind}", payload)
+        self._invalidate_cache()
+        return result
+    
+    async def _cached_get(
+        self,
+        key: Hashable,
+        ttl: float,
+        coro_factory: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Return cached result for key, fetching at most once per key concurrently"""
+        if ttl <= 0:
+            return await coro_factory()
+        key = (self._cache_epoch, key)
+        value = self._cache.get(key)
+        if value is not _MISSING:
+            return value
+        
+        # Concurrent misses for the same key share one fetch (as in
+        # _single_flight); a failed fetch is dropped so the next call retries
+        task = self._cache_fetches.get(key)
+        if task is None:
+            async def fetch() -> Dict[str, Any]:
+                result = await coro_factory()
+                self._cache.set(key, result, ttl)
+                return result
+            
+            task = asyncio.ensure_future(fetch())
+            self._cache_fetches[key] = task
+            task.add_done_callback(lambda _: self._cache_fetches.pop(key, None))
+        # Shield so one cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(task)
+    
+    def _invalidate_cache(self):
+        """Drop cached GET results after a write"""
+        self._cache_epoch += 1
+        self._cache.clear()
+    
     async def __aenter__(self):
         return self
     
@@ -33,107 +322,81 @@ class MemoryClient:
     # Ingest methods
     async def ingest_conversation(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Ingest conversation context"""
-        response = await self.client.post(
-            f"{self.base_url}/ingest/conversation",
-            json=payload
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._ingest("conversation", payload)
     
     async def ingest_text(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Ingest plain text"""
-        response = await self.client.post(
-            f"{self.base_url}/ingest/text",
-            json=payload
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._ingest("text", payload)
     
     async def ingest_code(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Ingest code change"""
-        response = await self.client.post(
-            f"{self.base_url}/ingest/code",
-            json=payload
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._ingest("code", payload)
     
     async def ingest_json(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Ingest JSON data"""
-        response = await self.client.post(
-            f"{self.base_url}/ingest/json",
-            json=payload
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._ingest("json", payload)
     
     # Search methods
     async def search_knowledge(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Search knowledge graph"""
-        response = await self.client.post(
-            f"{self.base_url}/search",
-            json=payload
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._single_flight("/search", payload)
     
     async def search_code(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Search code changes"""
-        response = await self.client.post(
-            f"{self.base_url}/search/code",
-            json=payload
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._single_flight("/search/code", payload)
     
     # Admin methods
     async def get_stats(self, project_id: str) -> Dict[str, Any]:
         """Get project statistics"""
-        response = await self.client.get(
-            f"{self.base_url}/stats/{project_id}"
+        return await self._cached_get(
+            ("stats", project_id),
+            config.STATS_CACHE_TTL,
+            lambda: self._request("GET", f"/stats/{project_id}")
         )
-        response.raise_for_status()
-        return response.json()
     
     async def clear_cache(self) -> Dict[str, Any]:
         """Clear cache"""
-        response = await self.client.post(
-            f"{self.base_url}/cache/clear"
-        )
-        response.raise_for_status()
-        return response.json()
+        result = await self._request("POST", "/cache/clear")
+        self._invalidate_cache()
+        return result
     
     async def health_check(self) -> Dict[str, Any]:
         """Health check"""
-        response = await self.client.get(f"{self.base_url}/")
-        response.raise_for_status()
-        return response.json()
+        return await self._cached_get(
+            ("health",),
+            config.HEALTH_CACHE_TTL,
+            lambda: self._request("GET", "/")
+        )
     
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        response = await self.client.get(
-            f"{self.base_url}/cache/stats"
+        return await self._cached_get(
+            ("cache_stats",),
+            config.CACHE_STATS_CACHE_TTL,
+            lambda: self._request("GET", "/cache/stats")
         )
-        response.raise_for_status()
-        return response.json()
 
 
 # Singleton instance
 _client: Optional[MemoryClient] = None
+_client_lock = asyncio.Lock()
 
 
 async def get_client() -> MemoryClient:
     """Get or create memory client instance"""
     global _client
     if _client is None:
-        _client = MemoryClient()
+        async with _client_lock:
+            if _client is None:
+                _client = MemoryClient()
     return _client
 
 
 async def close_client():
     """Close memory client"""
     global _client
-    if _client is not None:
-        await _client.close()
-        _client = None
+    async with _client_lock:
+        if _client is not None:
+            await _client.close()
+            _client = None
 
@@ -15,11 +15,30 @@ context that agents can use to provide informed responses about:
 """
 
 import json
+import logging
+import os
 import re
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from functools import cached_property
+from typing import Dict, Iterable, List, Any, Optional
 from pathlib import Path
 
+import orjson
+
+try:
+    import ijson  # Optional: incremental parsing of large results files
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# Results files above this size are stream-parsed when only the index is needed
+_STREAM_THRESHOLD_BYTES = 5 * 1024 * 1024
+
+# Formatting cleanup patterns (compiled once)
+_EQ_RE = re.compile(r'={80,}')
+_NL_RE = re.compile(r'\n\s*\n\s*\n')
+
 
 class SearchResultsFormatter:
     """Format search results into agent-ready context prompts"""
@@ -27,88 +46,151 @@ class SearchResultsFormatter:
     def __init__(self, results_file: str = "search_analysis_results.json"):
         """Initialize formatter with search results file"""
         self.results_file = results_file
-        self.results_data = self._load_results()
+        
+        # Raw content -> parsed knowledge items
+        self._items_cache: Dict[str, List[Dict[str, str]]] = {}
+    
+    @cached_property
+    def results_data(self) -> Dict[str, Any]:
+        """Full search results, loaded on first access"""
+        return self._load_results()
+    
+    @cached_property
+    def _by_query(self) -> Dict[str, Dict[str, Any]]:
+        """Query -> result index (first match wins, like a linear scan would)"""
+        if "results_data" not in self.__dict__ and self._should_stream():
+            detailed_results = self._stream_detailed_results()
+        else:
+            detailed_results = self.results_data.get("detailed_results", [])
+        
+        index: Dict[str, Dict[str, Any]] = {}
+        for result in detailed_results:
+            index.setdefault(result["query"], result)
+        return index
+    
+    def _should_stream(self) -> bool:
+        """Stream-parse only when ijson is available and the file is large"""
+        if ijson is None:
+            return False
+        try:
+            return os.path.getsize(self.results_file) > _STREAM_THRESHOLD_BYTES
+        except OSError:
+            return False
+    
+    def _stream_detailed_results(self) -> Iterable[Dict[str, Any]]:
+        """Yield detailed_results entries without loading the whole file"""
+        try:
+            with open(self.results_file, 'rb') as f:
+                yield from ijson.items(f, 'detailed_results.item', use_float=True)
+        except ijson.JSONError as e:
+            logger.error(f"Error parsing JSON: {e}")
     
     def _load_results(self) -> Dict[str, Any]:
         """Load search results from JSON file"""
         try:
-            with open(self.results_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.results_file, 'rb') as f:
+                return orjson.loads(f.read())
         except FileNotFoundError:
-            print(f"Results file {self.results_file} not found")
+            logger.error(f"Results file {self.results_file} not found")
             return {}
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Error parsing JSON: {e}")
             return {}
     
+    def _strategy_content(self, strategy_result: Dict[str, Any]) -> str:
+        """Response text of a strategy result (inline, or from its content_path)"""
+        if "content" in strategy_result:
+            return strategy_result["content"]
+        
+        content_path = strategy_result.get("content_path")
+        if not content_path:
+            return ""
+        try:
+            return (Path(self.results_file).parent / content_path).read_text(encoding='utf-8')
+        except OSError as e:
+            logger.error(f"Error reading response file {content_path}: {e}")
+            return ""
+    
     def _clean_content(self, content: str) -> str:
         """Clean and normalize content text"""
-        # Remove emoji and special characters
-        content = re.sub(r'🔍|[^\x00-\x7F]+', '', content)
+        # Remove emoji and other non-ASCII characters
+        content = content.encode('ascii', 'ignore').decode('ascii')
         
         # Clean up formatting
-        content = re.sub(r'={80,}', '=' * 50, content)
-        content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+        content = _EQ_RE.sub('=' * 50, content)
+        content = _NL_RE.sub('\n\n', content)
         content = content.strip()
         
         return content
     
     def _extract_knowledge_items(self, content: str) -> List[Dict[str, str]]:
-        """Extract individual knowledge items from search content (JSON format)"""
+        """Extract individual knowledge items from search content (JSON format)
+        
+        Raises ValueError if content is not valid JSON.
+        """
         items = []
         
-        try:
-            # Parse JSON content
-            data = json.loads(content)
-            results = data.get("results", [])
+        # Parse JSON content
+        data = orjson.loads(content)
+        results = data.get("results", [])
+        
+        for result in results:
+            # Extract key fields
+            text = result.get("text", "")
+            summary = result.get("summary", text)
+            name = result.get("name", "Unknown")
+            score = result.get("score", 0.0)
             
-            for result in results:
-                # Extract key fields
-                text = result.get("text", "")
-                summary = result.get("summary", text)
-                name = result.get("name", "Unknown")
-                score = result.get("score", 0.0)
-                
-                # Optional metadata
-                file_path = result.get("file_path", "")
-                change_type = result.get("change_type", "")
-                severity = result.get("severity", "")
-                
-                # Build item description
-                relationship = name.replace("_", " ").title()
-                
-                # Build summary with metadata
-                full_summary = summary
-                if file_path:
-                    full_summary += f" (File: {file_path})"
-                if change_type:
-                    full_summary += f" [Type: {change_type}]"
-                if severity:
-                    full_summary += f" [Severity: {severity}]"
-                
-                items.append({
-                    "relationship": relationship,
-                    "summary": full_summary,
-                    "score": f"Score: {score:.3f}",
-                    "raw_data": result  # Keep raw data for advanced processing
-                })
-        
-        except json.JSONDecodeError as e:
-            print(f"Warning: Failed to parse JSON content: {e}")
-            # Fallback: try old regex method for backward compatibility
-            pass
+            # Optional metadata
+            file_path = result.get("file_path", "")
+            change_type = result.get("change_type", "")
+            severity = result.get("severity", "")
+            
+            # Build item description
+            relationship = name.replace("_", " ").title()
+            
+            # Build summary with metadata
+            full_summary = summary
+            if file_path:
+                full_summary += f" (File: {file_path})"
+            if change_type:
+                full_summary += f" [Type: {change_type}]"
+            if severity:
+                full_summary += f" [Severity: {severity}]"
+            
+            items.append({
+                "relationship": relationship,
+                "summary": full_summary,
+                "score": f"Score: {score:.3f}",
+                "raw_data": result  # Keep raw data for advanced processing
+            })
         
         return items
     
+    def _knowledge_items(self, content: str) -> List[Dict[str, str]]:
+        """Parse content once, reusing the result on repeat lookups"""
+        items = self._items_cache.get(content)
+        if items is None:
+            # Cleanup only drops non-ASCII characters, shortens long '=' runs
+            # and collapses whitespace, which a JSON parser never sees between
+            # tokens; skip the pass when it could not change the parsed result
+            if not (content.isascii() and _EQ_RE.search(content) is None):
+                content_to_parse = self._clean_content(content)
+            else:
+                content_to_parse = content
+            try:
+                items = self._extract_knowledge_items(content_to_parse)
+            except ValueError as e:
+                logger.warning(f"Failed to parse JSON content: {e}")
+                items = []
+            self._items_cache[content] = items
+        return items
+    
     def format_query_context(self, query: str, strategy: str = "rrf") -> str:
         """Format search results for a specific query into agent context"""
         
         # Find the query in results
-        query_data = None
-        for result in self.results_data.get("detailed_results", []):
-            if result["query"] == query:
-                query_data = result
-                break
+        query_data = self._by_query.get(query)
         
         if not query_data:
             return f"No search results found for query: '{query}'"
@@ -118,39 +200,37 @@ class SearchResultsFormatter:
         if strategy_result.get("status") != "success":
             return f"No successful results for query '{query}' with strategy '{strategy}'"
         
-        content = strategy_result.get("content", "")
-        cleaned_content = self._clean_content(content)
-        knowledge_items = self._extract_knowledge_items(cleaned_content)
+        knowledge_items = self._knowledge_items(self._strategy_content(strategy_result))
         
         # Format as agent context
-        context = f"""KNOWLEDGE CONTEXT FOR: "{query}"
+        parts: List[str] = [f"""KNOWLEDGE CONTEXT FOR: "{query}"
 {'=' * 60}
 
 SEARCH STRATEGY: {strategy.upper()}
 EXPECTED CONTEXT: {query_data.get('expected_context', 'N/A')}
 
 RELEVANT KNOWLEDGE FOUND:
-"""
+"""]
         
         for i, item in enumerate(knowledge_items, 1):
-            context += f"""
+            parts.append(f"""
 {i}. RELATIONSHIP: {item['relationship']}
    KNOWLEDGE: {item['summary']}
    RELEVANCE: {item['score']}
-"""
+""")
         
         if not knowledge_items:
-            context += "\nNo structured knowledge items found in results."
+            parts.append("\nNo structured knowledge items found in results.")
         
-        context += f"""
+        parts.append(f"""
 USAGE INSTRUCTIONS FOR AGENT:
 - Use this knowledge to provide context-aware responses
 - Reference specific relationships and patterns found
 - Combine multiple knowledge items for comprehensive answers
 - Mention that this information comes from past coding sessions
-"""
+""")
         
-        return context
+        return "".join(parts)
     
     def format_all_queries_context(self, strategy: str = "rrf") -> str:
         """Format all search results into comprehensive agent context"""
@@ -159,7 +239,7 @@ USAGE INSTRUCTIONS FOR AGENT:
         project_id = self.results_data.get("project_id", "unknown")
         success_rate = self.results_data.get("success_rate", "unknown")
         
-        context = f"""COMPREHENSIVE KNOWLEDGE CONTEXT
+        parts: List[str] = [f"""COMPREHENSIVE KNOWLEDGE CONTEXT
 {'=' * 80}
 
 PROJECT: {project_id}
@@ -170,39 +250,37 @@ STRATEGY: {strategy.upper()}
 This context contains knowledge extracted from past coding conversations,
 bug fixes, performance optimizations, and implementation patterns.
 
-"""
+"""]
         
         for i, result in enumerate(self.results_data.get("detailed_results", []), 1):
             query = result["query"]
             description = result["description"]
             expected_context = result["expected_context"]
             
-            context += f"""
+            parts.append(f"""
 KNOWLEDGE DOMAIN {i}: {description.upper()}
 {'-' * 60}
 QUERY: "{query}"
 EXPECTED TOPICS: {expected_context}
 
-"""
+""")
             
             # Get strategy results
             strategy_result = result["results"].get(strategy, {})
             if strategy_result.get("status") == "success":
-                content = strategy_result.get("content", "")
-                cleaned_content = self._clean_content(content)
-                knowledge_items = self._extract_knowledge_items(cleaned_content)
+                knowledge_items = self._knowledge_items(self._strategy_content(strategy_result))
                 
                 for j, item in enumerate(knowledge_items, 1):
-                    context += f"""  {i}.{j} {item['relationship']}
+                    parts.append(f"""  {i}.{j} {item['relationship']}
       → {item['summary']}
-"""
+""")
                 
                 if not knowledge_items:
-                    context += "  No structured knowledge found.\n"
+                    parts.append("  No structured knowledge found.\n")
             else:
-                context += f"  Search failed: {strategy_result.get('status', 'unknown')}\n"
+                parts.append(f"  Search failed: {strategy_result.get('status', 'unknown')}\n")
         
-        context += f"""
+        parts.append(f"""
 
 AGENT USAGE GUIDELINES:
 {'=' * 80}
@@ -235,9 +313,9 @@ AGENT USAGE GUIDELINES:
    - User needs examples of past implementations
    - User wants to learn from previous solutions
    - User asks "how did we handle X before?"
-"""
+""")
         
-        return context
+        return "".join(parts)
     
     def generate_example_prompts(self) -> List[Dict[str, str]]:
         """Generate example user questions and agent responses using the knowledge"""
@@ -300,7 +378,7 @@ theme = preferences.get('theme', 'default')
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(context)
         
-        print(f"Agent context saved to: {output_file}")
+        logger.info(f"Agent context saved to: {output_file}")
         return output_file
     
     def save_example_prompts(self, output_file: str = "agent_example_prompts.json"):
@@ -311,18 +389,22 @@ theme = preferences.get('theme', 'default')
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(examples, f, indent=2, ensure_ascii=False)
         
-        print(f"Example prompts saved to: {output_file}")
+        logger.info(f"Example prompts saved to: {output_file}")
         return output_file
 
 
 def main():
     """Main function to demonstrate the formatter"""
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("SEARCH RESULTS FORMATTER")
     print("=" * 80)
     
-    # Initialize formatter
-    formatter = SearchResultsFormatter("search_analysis_results.json")
+    # Initialize formatter (test/test_search_analysis.py writes its results
+    # next to itself, whatever the working directory)
+    results_file = Path(__file__).resolve().parent / "test" / "search_analysis_results.json"
+    formatter = SearchResultsFormatter(str(results_file))
     
     if not formatter.results_data:
         print("No search results data available")
@@ -7,14 +7,30 @@ This allows for HTTP streaming and easier testing.
 
 from fastmcp import FastMCP
 from fastmcp.server.openapi import RouteMap, MCPType
+import functools
+import logging
 import sys
 import os
+import re
 import uvicorn
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
+# Startup diagnostics go through logging; LOG_LEVEL=DEBUG shows skipped routes.
+# Only the server entry points configure it, so importers keep their own setup
+logger = logging.getLogger(__name__)
+
+
+def configure_logging():
+    """Set up root logging from LOG_LEVEL (falls back to INFO if unknown)"""
+    level_name = os.getenv("LOG_LEVEL", "INFO").upper()
+    level = logging.getLevelName(level_name)
+    logging.basicConfig(level=level if isinstance(level, int) else logging.INFO, format="%(message)s")
+    if not isinstance(level, int):
+        logger.warning(f"[WARN] Unknown LOG_LEVEL={level_name!r}, using INFO")
+
 # Add memory_layer to Python path
 memory_layer_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "memory_layer"))
 sys.path.insert(0, memory_layer_path)
@@ -22,12 +38,22 @@ sys.path.insert(0, memory_layer_path)
 # Import the FastAPI app from memory_layer
 from app.main import app as fastapi_app
 
-print(f"[OK] Loaded FastAPI app from memory_layer: {fastapi_app.title}")
-
 # ============================================================================
 # CONVERT FASTAPI TO MCP SERVER
 # ============================================================================
 
+MCP_SERVER_NAME = "ZepAI Memory Layer"
+
+# Admin/maintenance path fragments excluded for POST endpoints
+ADMIN_PATTERNS = [
+    '/cache/',
+    '/admin/',
+    '/langfuse/',
+    '/config/',
+    '/innocody/'
+]
+_ADMIN_RE = re.compile("|".join(map(re.escape, ADMIN_PATTERNS)))
+
 # Define route filter function to exclude admin endpoints
 def should_include_route(route) -> bool:
     """
@@ -36,41 +62,18 @@ def should_include_route(route) -> bool:
     Returns False for routes we want to SKIP
     Returns True for routes we want to INCLUDE
     """
-    path = route.path
-    method = route.methods
+    # Mounts and other non-HTTP routes have no methods to filter on
+    methods = getattr(route, "methods", None)
+    if not methods:
+        return True
     
     # Skip admin/maintenance POST endpoints
-    admin_patterns = [
-        '/cache/',
-        '/admin/',
-        '/langfuse/',
-        '/config/',
-        '/innocody/'
-    ]
-    
-    if 'POST' in method:
-        for pattern in admin_patterns:
-            if pattern in path:
-                print(f"[SKIP] Excluding admin endpoint: POST {path}")
-                return False
+    if "POST" in methods and _ADMIN_RE.search(route.path):
+        return False
     
     # Include all other routes
     return True
 
-# Filter FastAPI routes before conversion
-from starlette.routing import Route
-filtered_routes = [route for route in fastapi_app.routes if should_include_route(route)]
-
-# Create filtered FastAPI app
-from fastapi import FastAPI
-filtered_app = FastAPI(
-    title=fastapi_app.title,
-    description=fastapi_app.description,
-    version=fastapi_app.version,
-    routes=filtered_routes,
-    lifespan=fastapi_app.router.lifespan_context
-)
-
 # Define custom route mapping rules (for filtered app)
 custom_route_maps = [
     # GET with path params → ResourceTemplates
@@ -88,17 +91,57 @@ custom_route_maps = [
     # POST/PUT/DELETE → Tools (default behavior)
 ]
 
-# Convert filtered FastAPI app to MCP server
-mcp = FastMCP.from_fastapi(
-    app=filtered_app,
-    name="ZepAI Memory Layer",
-    route_maps=custom_route_maps
-)
 
-print(f"[OK] Created MCP server: {mcp.name}")
-print(f"     Original endpoints: {len(fastapi_app.routes)}")
-print(f"     Filtered endpoints: {len(filtered_routes)}")
-print(f"     Excluded endpoints: {len(fastapi_app.routes) - len(filtered_routes)}")
+@functools.lru_cache(maxsize=1)
+def build_mcp() -> FastMCP:
+    """
+    Convert the FastAPI app to an MCP server (built once, on first use)
+    
+    Conversion parses every route's schema, so it is deferred until the
+    server is actually needed rather than run at import time.
+    """
+    # Filter FastAPI routes before conversion (single pass)
+    filtered_routes = [route for route in fastapi_app.routes if should_include_route(route)]
+    n_orig = len(fastapi_app.routes)
+    n_filt = len(filtered_routes)
+    
+    if n_filt < n_orig and logger.isEnabledFor(logging.DEBUG):
+        included = set(map(id, filtered_routes))
+        for route in fastapi_app.routes:
+            if id(route) not in included:
+                logger.debug(f"[SKIP] Excluding admin endpoint: POST {route.path}")
+    
+    # Convert with only the filtered routes visible. Swapping the router's
+    # route list avoids re-registering every route on a second FastAPI app;
+    # the original list and OpenAPI schema are restored afterwards.
+    original_routes = fastapi_app.router.routes
+    original_schema = fastapi_app.openapi_schema
+    fastapi_app.router.routes = filtered_routes
+    fastapi_app.openapi_schema = None
+    try:
+        server = FastMCP.from_fastapi(
+            app=fastapi_app,
+            name=MCP_SERVER_NAME,
+            route_maps=custom_route_maps
+        )
+    finally:
+        fastapi_app.router.routes = original_routes
+        fastapi_app.openapi_schema = original_schema
+    
+    logger.info(
+        f"[OK] Created MCP server: {server.name}\n"
+        f"     Original endpoints: {n_orig}\n"
+        f"     Filtered endpoints: {n_filt}\n"
+        f"     Excluded endpoints: {n_orig - n_filt}"
+    )
+    return server
+
+
+def __getattr__(name):
+    """Keep `from server_http import mcp` working without eager conversion"""
+    if name == "mcp":
+        return build_mcp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ============================================================================
 # CUSTOM TOOLS (Optional - currently empty)
@@ -122,7 +165,12 @@ def create_http_app():
     """
     from fastapi import FastAPI
     
+    # Also the uvicorn factory for WORKERS > 1, where each worker starts here
+    configure_logging()
+    logger.info(f"[OK] Loaded FastAPI app from memory_layer: {fastapi_app.title}")
+    
     # Create the MCP's ASGI app with '/mcp' path
+    mcp = build_mcp()
     mcp_app = mcp.http_app(path='/mcp')
     
     # Create a new FastAPI app that combines both sets of routes
@@ -130,28 +178,47 @@ def create_http_app():
         title="ZepAI Memory Layer with MCP",
         description="FastAPI + MCP Server - Auto-generated from memory_layer",
         version="2.0.0",
-        routes=[
-            *mcp_app.routes,      # MCP routes at /mcp/*
-            *fastapi_app.routes,  # Original API routes
-        ],
+        # MCP routes at /mcp/* followed by the original API routes
+        routes=mcp_app.routes + fastapi_app.routes,
         lifespan=mcp_app.lifespan,  # Important: use MCP lifespan
     )
     
-    print(f"\n[OK] Combined MCP routes and FastAPI routes")
-    print(f"[OK] Total routes: {len(combined_app.routes)}")
+    logger.info("[OK] Combined MCP routes and FastAPI routes")
+    logger.info(f"[OK] Total routes: {len(combined_app.routes)}")
     
     return combined_app
 
+
+def worker_count() -> int:
+    """Worker processes: WORKERS=<n>, or WORKERS=auto for min(cpu_count, 4)"""
+    workers_env = os.getenv("WORKERS", "").strip()
+    if workers_env == "auto":
+        return min(os.cpu_count() or 1, 4)
+    if not workers_env:
+        return 1
+    try:
+        workers = int(workers_env)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        logger.warning(f"[WARN] Invalid WORKERS={workers_env!r} (expected a positive integer or 'auto'), using 1")
+        return 1
+    return workers
+
+
 # ============================================================================
 # MAIN ENTRY POINT
 # ============================================================================
 
-if __name__ == "__main__":
+def main():
+    """Print the endpoint banner and run the server with uvicorn"""
+    configure_logging()
+    
     print("\n" + "="*70)
     print("FastMCP HTTP Server - Auto-generated from FastAPI")
     print("="*70)
     print(f"\nServer ready!")
-    print(f"  - Name: {mcp.name}")
+    print(f"  - Name: {MCP_SERVER_NAME}")
     print(f"  - Total routes converted: {len(fastapi_app.routes)}")
     print(f"\nHTTP Endpoints:")
     print(f"  - MCP Server (SSE): http://localhost:8002/mcp/sse")
@@ -165,16 +232,30 @@ if __name__ == "__main__":
     print(f"\nNote: FastMCP uses Server-Sent Events (SSE), not a web UI inspector.")
     print("\n" + "="*70)
     
-    # Create HTTP app
-    http_app = create_http_app()
+    workers = worker_count()
     
-    print("\nStarting HTTP MCP server on port 8002...")
+    print(f"\nStarting HTTP MCP server on port 8002 ({workers} worker(s))...")
     print("Press Ctrl+C to stop\n")
     
-    # Run with uvicorn
-    uvicorn.run(
-        http_app,
+    # uvicorn picks uvloop/httptools by itself when installed (uvicorn[standard])
+    server_options = dict(
         host="0.0.0.0",
         port=8002,
-        log_level="info"
+        log_level="info",
     )
+    if workers > 1:
+        # Multiple workers need an import string; each worker builds its own app
+        uvicorn.run(
+            "server_http:create_http_app",
+            factory=True,
+            workers=workers,
+            **server_options
+        )
+    else:
+        # Create HTTP app
+        http_app = create_http_app()
+        uvicorn.run(http_app, **server_options)
+
+
+if __name__ == "__main__":
+    main()
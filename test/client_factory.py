@@ -0,0 +1,53 @@
+"""
+Shared MCP client factory for the test scripts
+==============================================
+
+One pooled, orjson-encoding httpx client setup for every test module, so
+connection limits and request encoding stay the same across them.
+"""
+
+import httpx
+import orjson
+from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
+
+# Connection pool for the MCP HTTP transport (httpx defaults: 100 / 20 / 5s)
+HTTPX_LIMITS = httpx.Limits(
+    max_connections=200,
+    max_keepalive_connections=100,
+    keepalive_expiry=30
+)
+
+
+class _OrjsonAsyncClient(httpx.AsyncClient):
+    """httpx client that encodes `json=` request bodies with orjson"""
+    
+    def build_request(self, method, url, *, json=None, headers=None, **kwargs):
+        if json is not None:
+            headers = httpx.Headers(headers)
+            headers.setdefault("Content-Type", "application/json")
+            kwargs["content"] = orjson.dumps(json)
+        return super().build_request(method, url, headers=headers, **kwargs)
+
+
+def _pooled_http_client(headers=None, timeout=None, auth=None, **kwargs) -> httpx.AsyncClient:
+    """httpx client factory for the MCP transport, with HTTPX_LIMITS applied"""
+    kwargs.setdefault("follow_redirects", True)
+    return _OrjsonAsyncClient(
+        headers=headers,
+        timeout=timeout or httpx.Timeout(30.0),
+        auth=auth,
+        limits=HTTPX_LIMITS,
+        **kwargs
+    )
+
+
+def make_client(url: str) -> Client:
+    """
+    Create an MCP client for url
+    
+    The MCP transport posts each JSON-RPC message as a plain dict through
+    httpx's `json=`, i.e. stdlib json.dumps; the payloads here are encoded
+    with orjson instead.
+    """
+    return Client(StreamableHttpTransport(url, httpx_client_factory=_pooled_http_client))
@@ -20,318 +20,339 @@ IMPORTANT NOTES:
    allowing read-only monitoring and inspection.
 """
 import asyncio
+import hashlib
+import os
+import secrets
+import sys
+import time
+from datetime import datetime, timezone
+
 from fastmcp import Client
 
+from client_factory import make_client
+
 # Server configuration
 BASE_URL = "http://localhost:8002/mcp"  # server_http.py runs on port 8002
 
+# Performance test fan-out: total requests and max in flight at once
+# (at least 1 each: a zero semaphore never admits a call)
+PERF_REQUESTS = max(1, int(os.getenv("PERF_REQUESTS", "5")))
+PERF_CONCURRENCY = max(1, int(os.getenv("PERF_CONCURRENCY", "32")))
+
+# Emoji in tool results -> ASCII tags (all single code points, so one
+# str.translate pass replaces them all)
+_EMOJI_TABLE = str.maketrans({'🔍': '[SEARCH]', '✅': '[OK]', '❌': '[ERROR]'})
+
+# Content hashes for the fixed ingest_conversation payload
+_HASH_Q1 = hashlib.sha256(b"How does FastMCP work?").hexdigest()
+_HASH_A1 = hashlib.sha256(b"FastMCP is a framework for building MCP servers with Python decorators.").hexdigest()
+_HASH_TEST_FILE = hashlib.sha256(b"test.py").hexdigest()
+_HASH_TOOL_ARGS = hashlib.sha256(b"test_tool:args").hexdigest()
+
+
+def _preview(text: str) -> str:
+    """First 200 chars of a tool result, with emoji mapped to ASCII tags"""
+    return text[:200].translate(_EMOJI_TABLE) if text else ""
 
-async def test_basic_functionality():
+
+async def test_basic_functionality(client: Client, tools: list, resources: list):
     """Test basic server functionality"""
     print("\n" + "="*80)
     print("TEST 1: Basic Server Functionality")
     print("="*80)
     
-    async with Client(BASE_URL) as client:
-        # List all tools
-        print("\n1. Listing available tools...")
-        tools = await client.list_tools()
-        print(f"   Found {len(tools)} tools:")
-        for tool in tools:
-            print(f"   - {tool.name}: {tool.description[:60]}...")
-        
-        # List all resources
-        print("\n2. Listing available resources...")
-        resources = await client.list_resources()
-        print(f"   Found {len(resources)} resources:")
-        for resource in resources:
-            print(f"   - {resource.uri}: {resource.description[:60]}...")
-        
-        # Test specific resource URIs if no resources found
-        if len(resources) == 0:
-            print("   No resources found via list_resources(). Trying specific URIs...")
-            test_uris = [
-                "memory://conversations/fastmcp_test",
-                "memory://stats/fastmcp_test"
-            ]
-            for uri in test_uris:
-                try:
-                    content = await client.read_resource(uri)
-                    print(f"   ✓ Found resource: {uri}")
-                except Exception as e:
-                    print(f"   ✗ Resource not found: {uri} - {str(e)[:50]}...")
-        
-        print("[OK] Basic functionality test passed!")
+    # List all tools
+    print("\n1. Listing available tools...")
+    print(f"   Found {len(tools)} tools:")
+    for tool in tools:
+        print(f"   - {tool.name}: {tool.description[:60]}...")
+    
+    # List all resources
+    print("\n2. Listing available resources...")
+    print(f"   Found {len(resources)} resources:")
+    for resource in resources:
+        print(f"   - {resource.uri}: {resource.description[:60]}...")
+    
+    # Test specific resource URIs if no resources found
+    if len(resources) == 0:
+        print("   No resources found via list_resources(). Trying specific URIs...")
+        test_uris = [
+            "memory://conversations/fastmcp_test",
+            "memory://stats/fastmcp_test"
+        ]
+        for uri in test_uris:
+            try:
+                content = await client.read_resource(uri)
+                print(f"   ✓ Found resource: {uri}")
+            except Exception as e:
+                print(f"   ✗ Resource not found: {uri} - {str(e)[:50]}...")
+    
+    print("[OK] Basic functionality test passed!")
 
 
-async def test_ingest_tools():
+async def test_ingest_tools(client: Client):
     """Test all ingest tools"""
     print("\n" + "="*80)
     print("TEST 2: Ingest Tools")
     print("="*80)
     
-    async with Client(BASE_URL) as client:
-        # Test ingest_text
-        print("\n1. Testing ingest_text...")
-        result = await client.call_tool("ingest_text", {
-            "text": "This is a comprehensive test memory from FastMCP client for testing text ingestion capabilities",
-            "project_id": "fastmcp_test",
-            "name": "Test Text Memory"
-        })
-        result_text = result.content[0].text[:200].replace('🔍', '[SEARCH]').replace('✅', '[OK]').replace('❌', '[ERROR]')
-        print(f"   Result: {result_text}...")
-        
-        # Test ingest_conversation
-        print("\n2. Testing ingest_conversation...")
-        import hashlib
-        import uuid as uuid_lib
-        from datetime import datetime
-        
-        timestamp = datetime.utcnow().isoformat() + "Z"
-        result = await client.call_tool("ingest_conversation", {
-            "request_id": "test_request_001",
-            "project_id": "fastmcp_test",
-            "timestamp": timestamp,
-            "chat_meta": {
-                "chat_id": "test_chat_001",
-                "base_chat_id": "test",
-                "request_attempt_id": f"attempt_{uuid_lib.uuid4().hex[:8]}",
-                "chat_mode": "AGENT"
+    # Test ingest_text
+    print("\n1. Testing ingest_text...")
+    result = await client.call_tool("ingest_text", {
+        "text": "This is a comprehensive test memory from FastMCP client for testing text ingestion capabilities",
+        "project_id": "fastmcp_test",
+        "name": "Test Text Memory"
+    })
+    print(f"   Result: {_preview(result.content[0].text)}...")
+    
+    # Test ingest_conversation
+    print("\n2. Testing ingest_conversation...")
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    result = await client.call_tool("ingest_conversation", {
+        "request_id": "test_request_001",
+        "project_id": "fastmcp_test",
+        "timestamp": timestamp,
+        "chat_meta": {
+            "chat_id": "test_chat_001",
+            "base_chat_id": "test",
+            "request_attempt_id": f"attempt_{secrets.token_hex(4)}",
+            "chat_mode": "AGENT"
+        },
+        "messages": [
+            {
+                "sequence": 0,
+                "role": "user",
+                "content_summary": "How does FastMCP work?",
+                "content_hash": _HASH_Q1,
+                "total_tokens": 5
             },
-            "messages": [
-                {
-                    "sequence": 0,
-                    "role": "user",
-                    "content_summary": "How does FastMCP work?",
-                    "content_hash": hashlib.sha256("How does FastMCP work?".encode()).hexdigest(),
-                    "total_tokens": 5,
-                    "sequence": 0
-                },
-                {
-                    "sequence": 1,
-                    "role": "assistant",
-                    "content_summary": "FastMCP is a framework for building MCP servers with Python decorators.",
-                    "content_hash": hashlib.sha256("FastMCP is a framework for building MCP servers with Python decorators.".encode()).hexdigest(),
-                    "prompt_tokens": 10,
-                    "completion_tokens": 15,
-                    "total_tokens": 25,
-                    "sequence": 1
-                }
-            ],
-            "context_files": [
-                {
-                    "file_path": "test.py",
-                    "usefulness": 0.8,
-                    "content_hash": hashlib.sha256("test.py".encode()).hexdigest(),
-                    "source": "vecdb",
-                    "symbols": ["test_function"],
-                    "language": "python"
-                }
-            ],
-            "tool_calls": [
-                {
-                    "tool_call_id": f"call_{uuid_lib.uuid4().hex[:8]}",
-                    "tool_name": "test_tool",
-                    "arguments_hash": hashlib.sha256("test_tool:args".encode()).hexdigest(),
-                    "status": "success",
-                    "execution_time_ms": 200
-                }
-            ],
-            "code_changes": []
-        })
-        result_text = result.content[0].text[:200].replace('🔍', '[SEARCH]').replace('✅', '[OK]').replace('❌', '[ERROR]')
-        print(f"   Result: {result_text}...")
-        
-        # Test ingest_code_change
-        print("\n3. Testing ingest_code_change...")
-        result = await client.call_tool("ingest_code_change", {
-            "name": "Test Code Change",
-            "summary": "Added comprehensive test cases for FastMCP server",
-            "file_path": "test_client.py",
-            "change_type": "added",
-            "severity": "medium",
-            "lines_added": 50,
-            "lines_removed": 0,
-            "function_name": "test_comprehensive",
-            "project_id": "fastmcp_test"
-        })
-        result_text = result.content[0].text[:200].replace('🔍', '[SEARCH]').replace('✅', '[OK]').replace('❌', '[ERROR]')
-        print(f"   Result: {result_text}...")
-        
-        # Test ingest_json - SKIPPED due to memory layer backend bug
-        print("\n4. Testing ingest_json...")
-        print("   [SKIP] ingest_json test skipped due to memory layer backend validation error")
-        print("   Note: Memory layer expects episode_body to be string, but receives dict")
-        print("   This needs to be fixed in memory_layer/app/routes/basic.py")
-        
-        print("[OK] Ingest tools test passed!")
+            {
+                "sequence": 1,
+                "role": "assistant",
+                "content_summary": "FastMCP is a framework for building MCP servers with Python decorators.",
+                "content_hash": _HASH_A1,
+                "prompt_tokens": 10,
+                "completion_tokens": 15,
+                "total_tokens": 25
+            }
+        ],
+        "context_files": [
+            {
+                "file_path": "test.py",
+                "usefulness": 0.8,
+                "content_hash": _HASH_TEST_FILE,
+                "source": "vecdb",
+                "symbols": ["test_function"],
+                "language": "python"
+            }
+        ],
+        "tool_calls": [
+            {
+                "tool_call_id": f"call_{secrets.token_hex(4)}",
+                "tool_name": "test_tool",
+                "arguments_hash": _HASH_TOOL_ARGS,
+                "status": "success",
+                "execution_time_ms": 200
+            }
+        ],
+        "code_changes": []
+    })
+    print(f"   Result: {_preview(result.content[0].text)}...")
+    
+    # Test ingest_code_change
+    print("\n3. Testing ingest_code_change...")
+    result = await client.call_tool("ingest_code_change", {
+        "name": "Test Code Change",
+        "summary": "Added comprehensive test cases for FastMCP server",
+        "file_path": "test_client.py",
+        "change_type": "added",
+        "severity": "medium",
+        "lines_added": 50,
+        "lines_removed": 0,
+        "function_name": "test_comprehensive",
+        "project_id": "fastmcp_test"
+    })
+    print(f"   Result: {_preview(result.content[0].text)}...")
+    
+    # Test ingest_json - SKIPPED due to memory layer backend bug
+    print("\n4. Testing ingest_json...")
+    print("   [SKIP] ingest_json test skipped due to memory layer backend validation error")
+    print("   Note: Memory layer expects episode_body to be string, but receives dict")
+    print("   This needs to be fixed in memory_layer/app/routes/basic.py")
+    
+    print("[OK] Ingest tools test passed!")
 
 
-async def test_search_tools():
+async def test_search_tools(client: Client):
     """Test all search tools"""
     print("\n" + "="*80)
     print("TEST 3: Search Tools")
     print("="*80)
     
-    async with Client(BASE_URL) as client:
-        # Test search
-        print("\n1. Testing search...")
-        result = await client.call_tool("search", {
-            "query": "FastMCP test memory comprehensive",
-            "group_id": "fastmcp_test",  # Correct parameter name for project isolation
-            "limit": 10,
-            "rerank_strategy": "rrf"
-        })
-        result_text = result.content[0].text[:200].replace('🔍', '[SEARCH]').replace('✅', '[OK]').replace('❌', '[ERROR]')
-        print(f"   Result: {result_text}...")
-        
-        # Test search_code
-        print("\n2. Testing search_code...")
-        result = await client.call_tool("search_code", {
-            "query": "test code change function",
-            "project_id": "fastmcp_test",
-            "change_type_filter": "added",  # Correct parameter name
-            "days_ago": 7  # Optional: search last 7 days
-        })
-        result_text = result.content[0].text[:200].replace('🔍', '[SEARCH]').replace('✅', '[OK]').replace('❌', '[ERROR]')
-        print(f"   Result: {result_text}...")
-        
-        # Test search with LLM classification (replaces smart_search)
-        print("\n3. Testing search with LLM classification...")
-        result = await client.call_tool("search", {
-            "query": "comprehensive test framework capabilities",
-            "group_id": "fastmcp_test",
-            "limit": 5,
-            "use_llm_classification": True,  # Enable LLM strategy selection
-            "conversation_type": "testing"
-        })
-        result_text = result.content[0].text[:200].replace('🔍', '[SEARCH]').replace('✅', '[OK]').replace('❌', '[ERROR]')
-        print(f"   Result: {result_text}...")
-        
-        print("[OK] Search tools test passed!")
+    # Test search
+    print("\n1. Testing search...")
+    result = await client.call_tool("search", {
+        "query": "FastMCP test memory comprehensive",
+        "group_id": "fastmcp_test",  # Correct parameter name for project isolation
+        "limit": 10,
+        "rerank_strategy": "rrf"
+    })
+    print(f"   Result: {_preview(result.content[0].text)}...")
+    
+    # Test search_code
+    print("\n2. Testing search_code...")
+    result = await client.call_tool("search_code", {
+        "query": "test code change function",
+        "project_id": "fastmcp_test",
+        "change_type_filter": "added",  # Correct parameter name
+        "days_ago": 7  # Optional: search last 7 days
+    })
+    print(f"   Result: {_preview(result.content[0].text)}...")
+    
+    # Test search with LLM classification (replaces smart_search)
+    print("\n3. Testing search with LLM classification...")
+    result = await client.call_tool("search", {
+        "query": "comprehensive test framework capabilities",
+        "group_id": "fastmcp_test",
+        "limit": 5,
+        "use_llm_classification": True,  # Enable LLM strategy selection
+        "conversation_type": "testing"
+    })
+    print(f"   Result: {_preview(result.content[0].text)}...")
+    
+    print("[OK] Search tools test passed!")
 
 
-async def test_admin_tools():
+async def test_admin_tools(client: Client):
     """Test admin and maintenance tools"""
     print("\n" + "="*80)
     print("TEST 4: Admin Tools")
     print("="*80)
     
-    async with Client(BASE_URL) as client:
-        # NOTE: Admin POST endpoints are filtered out in server_http.py
-        # Only GET endpoints (resources) are exposed
-        
-        # Test get_tool_stats (from resources, not tools)
-        print("\n1. Testing get_tool_stats...")
-        print("   [SKIP] get_tool_stats is a resource, not a tool")
-        print("   Note: Admin tools are mostly resources in this implementation")
-        
-        # Test health_check (this is a resource, not a tool)
-        print("\n2. Testing health_check...")
-        print("   [SKIP] health_check is a resource, not a tool")
-        
-        # Test get_cache_stats (this is a resource, not a tool)
-        print("\n3. Testing get_cache_stats...")
-        print("   [SKIP] get_cache_stats is a resource, not a tool")
-        
-        # Test clear_cache - FILTERED OUT in server_http.py
-        print("\n4. Testing clear_cache...")
-        print("   [SKIP] clear_cache is filtered out (admin POST endpoint)")
-        print("   Note: Admin POST endpoints (/cache/, /admin/, /langfuse/, /config/, /innocody/)")
-        print("         are excluded from MCP server to prevent accidental modifications")
-        
-        print("\n[OK] Admin tools test passed!")
+    # NOTE: Admin POST endpoints are filtered out in server_http.py
+    # Only GET endpoints (resources) are exposed
+    
+    # Test get_tool_stats (from resources, not tools)
+    print("\n1. Testing get_tool_stats...")
+    print("   [SKIP] get_tool_stats is a resource, not a tool")
+    print("   Note: Admin tools are mostly resources in this implementation")
+    
+    # Test health_check (this is a resource, not a tool)
+    print("\n2. Testing health_check...")
+    print("   [SKIP] health_check is a resource, not a tool")
+    
+    # Test get_cache_stats (this is a resource, not a tool)
+    print("\n3. Testing get_cache_stats...")
+    print("   [SKIP] get_cache_stats is a resource, not a tool")
+    
+    # Test clear_cache - FILTERED OUT in server_http.py
+    print("\n4. Testing clear_cache...")
+    print("   [SKIP] clear_cache is filtered out (admin POST endpoint)")
+    print("   Note: Admin POST endpoints (/cache/, /admin/, /langfuse/, /config/, /innocody/)")
+    print("         are excluded from MCP server to prevent accidental modifications")
+    
+    print("\n[OK] Admin tools test passed!")
 
 
-async def test_resources():
+async def test_resources(client: Client, resources: list):
     """Test all resources"""
     print("\n" + "="*80)
     print("TEST 5: Resources")
     print("="*80)
     
-    async with Client(BASE_URL) as client:
-        resources = await client.list_resources()
-        
-        for i, resource in enumerate(resources, 1):
-            print(f"\n{i}. Testing resource: {resource.uri}")
-            try:
-                content = await client.read_resource(resource.uri)
-                print(f"   Content preview: {str(content)[:200]}...")
-            except Exception as e:
-                print(f"   Error: {str(e)[:200]}...")
-        
-        print("\n[OK] Resources test completed!")
+    # Read-only requests: fetch all at once, one failure doesn't abort the rest
+    contents = await asyncio.gather(
+        *(client.read_resource(resource.uri) for resource in resources),
+        return_exceptions=True
+    )
+    
+    for i, (resource, content) in enumerate(zip(resources, contents), 1):
+        print(f"\n{i}. Testing resource: {resource.uri}")
+        if isinstance(content, Exception):
+            print(f"   Error: {str(content)[:200]}...")
+        else:
+            print(f"   Content preview: {str(content)[:200]}...")
+    
+    print("\n[OK] Resources test completed!")
 
 
-async def test_error_handling():
+async def test_error_handling(client: Client):
     """Test error handling with invalid inputs"""
     print("\n" + "="*80)
     print("TEST 6: Error Handling")
     print("="*80)
     
-    async with Client(BASE_URL) as client:
-        # Test invalid tool name
-        print("\n1. Testing invalid tool name...")
-        try:
-            result = await client.call_tool("invalid_tool", {})
-            print(f"   Unexpected success: {result}")
-        except Exception as e:
-            print(f"   Expected error: {str(e)[:200]}...")
-        
-        # Test invalid parameters
-        print("\n2. Testing invalid parameters (empty text)...")
-        try:
-            result = await client.call_tool("ingest_text", {
-                "text": "",  # Empty text should fail validation
-                "project_id": "test",
-                "name": "Test Invalid Input"
-            })
-            print(f"   [UNEXPECTED] Request succeeded when it should have failed!")
-            result_text = result.content[0].text[:200]
-            print(f"   Result: {result_text}...")
-        except Exception as e:
-            print(f"   [EXPECTED] Validation error: {str(e)[:150]}...")
-        
-        # Test invalid resource URI
-        print("\n3. Testing invalid resource URI...")
-        try:
-            content = await client.read_resource("memory://invalid/resource")
-            print(f"   Unexpected success: {content}")
-        except Exception as e:
-            print(f"   Expected error: {str(e)[:200]}...")
-        
-        print("\n[OK] Error handling test completed!")
+    # Test invalid tool name
+    print("\n1. Testing invalid tool name...")
+    try:
+        result = await client.call_tool("invalid_tool", {})
+        print(f"   Unexpected success: {result}")
+    except Exception as e:
+        print(f"   Expected error: {str(e)[:200]}...")
+    
+    # Test invalid parameters
+    print("\n2. Testing invalid parameters (empty text)...")
+    try:
+        result = await client.call_tool("ingest_text", {
+            "text": "",  # Empty text should fail validation
+            "project_id": "test",
+            "name": "Test Invalid Input"
+        })
+        print(f"   [UNEXPECTED] Request succeeded when it should have failed!")
+        result_text = result.content[0].text[:200]
+        print(f"   Result: {result_text}...")
+    except Exception as e:
+        print(f"   [EXPECTED] Validation error: {str(e)[:150]}...")
+    
+    # Test invalid resource URI
+    print("\n3. Testing invalid resource URI...")
+    try:
+        content = await client.read_resource("memory://invalid/resource")
+        print(f"   Unexpected success: {content}")
+    except Exception as e:
+        print(f"   Expected error: {str(e)[:200]}...")
+    
+    print("\n[OK] Error handling test completed!")
 
 
-async def test_performance():
-    """Test performance with multiple concurrent requests"""
+async def test_performance(client: Client):
+    """Test performance of concurrent requests over a single multiplexed session"""
     print("\n" + "="*80)
     print("TEST 7: Performance Test")
     print("="*80)
     
-    async with Client(BASE_URL) as client:
-        import time
-        
-        # Test concurrent tool calls
-        print("\n1. Testing concurrent tool calls...")
-        start_time = time.time()
-        
-        tasks = []
-        for i in range(5):
-            task = client.call_tool("ingest_text", {
-                "text": f"Performance test memory #{i} with concurrent execution",
-                "project_id": "fastmcp_test",
-                "name": f"Performance Test {i}"
-            })
-            tasks.append(task)
-        
-        results = await asyncio.gather(*tasks)
-        end_time = time.time()
-        
-        print(f"   Completed {len(results)} concurrent requests in {end_time - start_time:.2f} seconds")
-        print(f"   Average time per request: {(end_time - start_time) / len(results):.2f} seconds")
-        
-        print("\n[OK] Performance test completed!")
+    # Test concurrent tool calls (all multiplexed on the one session)
+    print("\n1. Testing concurrent tool calls (single multiplexed session)...")
+    payloads = [
+        {
+            "text": f"Performance test memory #{i} with concurrent execution",
+            "project_id": "fastmcp_test",
+            "name": f"Performance Test {i}"
+        }
+        for i in range(PERF_REQUESTS)
+    ]
+    sem = asyncio.Semaphore(PERF_CONCURRENCY)
+    
+    async def bounded(payload):
+        # Concurrent calls share the one session, as in the other tests, so
+        # this times multiplexing on it rather than independent clients
+        async with sem:
+            return await client.call_tool("ingest_text", payload)
+    
+    start_time = time.perf_counter()
+    if sys.version_info >= (3, 11):
+        # TaskGroup cancels the remaining calls as soon as one fails
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(bounded(payload)) for payload in payloads]
+        results = [task.result() for task in tasks]
+    else:
+        results = await asyncio.gather(*(bounded(payload) for payload in payloads))
+    end_time = time.perf_counter()
+    
+    print(f"   Completed {len(results)} concurrent requests on one session in {end_time - start_time:.2f} seconds")
+    print(f"   Average time per request: {(end_time - start_time) / len(results):.2f} seconds")
+    
+    print("\n[OK] Performance test completed!")
 
 
 async def test_fastmcp_server():
@@ -342,14 +363,19 @@ async def test_fastmcp_server():
     print("="*80)
     
     try:
-        # Run all test suites
-        await test_basic_functionality()
-        await test_ingest_tools()
-        await test_search_tools()
-        await test_admin_tools()
-        await test_resources()
-        await test_error_handling()
-        await test_performance()
+        # Run all test suites over one session (single MCP handshake)
+        async with make_client(BASE_URL) as client:
+            # Tool/resource listings are static for the server's lifetime
+            tools = await client.list_tools()
+            resources = await client.list_resources()
+            
+            await test_basic_functionality(client, tools, resources)
+            await test_ingest_tools(client)
+            await test_search_tools(client)
+            await test_admin_tools(client)
+            await test_resources(client, resources)
+            await test_error_handling(client)
+            await test_performance(client)
         
         print("\n" + "="*80)
         print("[SUCCESS] All test suites completed!")
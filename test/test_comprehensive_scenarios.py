@@ -30,21 +30,33 @@ IMPORTANT NOTES:
   * get_tool_stats (resource)
   * langfuse_health (resource)
 
+- All scenarios share ONE Client session (one MCP handshake per run) and
+  run concurrently. Scenarios must not mutate client state; keep anything
+  scenario-private in local variables.
+
 Inspired by test_realistic_scenarios.py and test_reranking_strategies.py
 """
 
 import asyncio
+import contextlib
+import contextvars
+import functools
+import itertools
 import time
 import hashlib
-import uuid as uuid_lib
-from datetime import datetime
-from typing import Dict, List, Any
+import os
+import secrets
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
 from collections import defaultdict
-import json
 from pathlib import Path
 
+import orjson
 from fastmcp import Client
 
+from client_factory import make_client
+
 
 # =============================================================================
 # TEST CONFIGURATION
@@ -52,6 +64,26 @@ from fastmcp import Client
 
 BASE_URL = "http://localhost:8002/mcp"  # server_http.py runs on port 8002
 PROJECT_ID = "fastmcp_comprehensive_test"
+_UTC = timezone.utc
+
+# Max scenarios in an ingestion burst at once; search/read phases overlap freely
+SCENARIO_CONCURRENCY = 3
+
+# Max in-flight requests per phase of the stress test
+STRESS_CONCURRENCY = 8
+
+# Per-scenario time limit in seconds (SCENARIO_TIMEOUT env overrides)
+SCENARIO_TIMEOUT = float(os.getenv("SCENARIO_TIMEOUT", "120"))
+
+# Result files, next to this module regardless of the working directory
+_TEST_DIR = Path(__file__).resolve().parent
+RESULTS_FILE = _TEST_DIR / "comprehensive_test_results.json"
+PROGRESS_FILE = _TEST_DIR / "comprehensive_test_results.jsonl"  # one line per scenario, rewritten each run
+
+# Per-step progress lines; SCENARIO_VERBOSE=0 keeps only headers and summary.
+# Defaults to on for an interactive terminal, off when piped or under CI
+_INTERACTIVE = sys.stdout.isatty() and not os.getenv("CI")
+VERBOSE = os.getenv("SCENARIO_VERBOSE", "1" if _INTERACTIVE else "0") == "1"
 
 # Test data categories
 TEST_CATEGORIES = {
@@ -71,19 +103,20 @@ TEST_CATEGORIES = {
 
 def make_request_id(prefix: str = "req") -> str:
     """Generate unique request ID"""
-    return f"{prefix}_{uuid_lib.uuid4().hex[:12]}"
+    return f"{prefix}_{secrets.token_hex(6)}"
 
 
 def make_chat_id(session: str) -> str:
     """Generate chat ID for session"""
-    return f"chat_{session}_{uuid_lib.uuid4().hex[:8]}"
+    return f"chat_{session}_{secrets.token_hex(4)}"
 
 
 def make_timestamp() -> str:
     """Generate ISO format timestamp"""
-    return datetime.utcnow().isoformat() + "Z"
+    return datetime.now(_UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
 
 
+@functools.lru_cache(maxsize=4096)
 def make_content_hash(content: str) -> str:
     """Generate SHA256 hash for content"""
     return hashlib.sha256(content.encode()).hexdigest()
@@ -101,35 +134,47 @@ def make_context_file(file_path: str, usefulness: float, source: str = "vecdb")
     }
 
 
+# File extension -> language, for context files and code changes
+EXT_MAP = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.jsx': 'javascript',
+    '.tsx': 'typescript',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.c': 'c',
+    '.rb': 'ruby',
+    '.php': 'php',
+    '.cs': 'csharp',
+}
+
+
+@functools.lru_cache(maxsize=4096)
 def detect_language(file_path: str) -> str:
     """Detect language from file extension"""
-    ext_map = {
-        '.py': 'python',
-        '.js': 'javascript',
-        '.ts': 'typescript',
-        '.jsx': 'javascript',
-        '.tsx': 'typescript',
-        '.go': 'go',
-        '.rs': 'rust',
-        '.java': 'java',
-        '.cpp': 'cpp',
-        '.c': 'c',
-        '.rb': 'ruby',
-        '.php': 'php',
-        '.cs': 'csharp',
+    return EXT_MAP.get(os.path.splitext(file_path)[1], 'unknown')
+
+
+# Tool calls are the only payloads with an interned base dict (strings only,
+# copied into each call). Context files are built fresh per call; their hash
+# and language come from the cached make_content_hash / detect_language
+@functools.lru_cache(maxsize=256)
+def _tool_call_base(tool_name: str) -> Dict:
+    """Shared (read-only) fields of every call to tool_name"""
+    return {
+        "tool_name": tool_name,
+        "arguments_hash": make_content_hash(f"{tool_name}:args")
     }
-    for ext, lang in ext_map.items():
-        if file_path.endswith(ext):
-            return lang
-    return 'unknown'
 
 
 def make_tool_call(tool_name: str, status: str = "success", execution_time_ms: int = 200) -> Dict:
     """Create tool call payload"""
     return {
-        "tool_call_id": f"call_{uuid_lib.uuid4().hex[:8]}",
-        "tool_name": tool_name,
-        "arguments_hash": make_content_hash(f"{tool_name}:args"),
+        "tool_call_id": f"call_{secrets.token_hex(4)}",
+        **_tool_call_base(tool_name),
         "status": status,
         "execution_time_ms": execution_time_ms
     }
@@ -164,24 +209,102 @@ def make_code_change(
     }
 
 
+async def _start(coro) -> asyncio.Task:
+    """Schedule coro and yield once so its request goes out before we continue"""
+    task = asyncio.create_task(coro)
+    await asyncio.sleep(0)
+    return task
+
+
+async def _join(*tasks: asyncio.Task) -> List[Any]:
+    """Await tasks started with _start; if one fails, cancel the rest before re-raising"""
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _burst(sem: Optional[asyncio.Semaphore]):
+    """Context guarding an ingestion burst: sem if given, else a no-op"""
+    return sem if sem is not None else contextlib.nullcontext()
+
+
+async def _bounded(coro, sem: asyncio.Semaphore):
+    """Await coro while holding sem"""
+    async with sem:
+        return await coro
+
+
+# Output buffer of the scenario running in the current task. The suite runner
+# sets one per scenario, so scenarios running concurrently print as whole
+# blocks when they finish instead of interleaving line by line
+_OUTPUT: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar("scenario_output", default=None)
+
+
+def _emit(text: str):
+    """Write text to the current scenario's buffer, or to stdout outside one"""
+    buffer = _OUTPUT.get()
+    if buffer is None:
+        sys.stdout.write(text)
+    else:
+        buffer.append(text)
+
+
+@functools.lru_cache(maxsize=32)
+def _banner(title: str, char: str) -> str:
+    """Rendered section header (same text the old three prints produced)"""
+    rule = char * 80
+    return f"\n{rule}\n{title}\n{rule}\n"
+
+
 def print_section(title: str, char: str = "="):
     """Print formatted section header"""
-    print(f"\n{char * 80}")
-    print(f"{title}")
-    print(f"{char * 80}")
+    _emit(_banner(title, char))
+
+
+def format_result(label: str, value: Any, indent: int = 0) -> str:
+    """Format a result line"""
+    return f"{'  ' * indent}{label}: {value}"
+
+
+def print_step(*args):
+    """Print a scenario progress line (skipped unless VERBOSE)"""
+    if VERBOSE:
+        _emit(" ".join(map(str, args)) + "\n")
 
 
 def print_result(label: str, value: Any, indent: int = 0):
-    """Print formatted result"""
-    prefix = "  " * indent
-    print(f"{prefix}{label}: {value}")
+    """Print formatted result (skipped unless VERBOSE)"""
+    if not VERBOSE:
+        return
+    _emit(format_result(label, value, indent) + "\n")
 
 
 # =============================================================================
 # SCENARIO 1: ASYNC/AWAIT REFACTORING WORKFLOW
 # =============================================================================
 
-async def scenario_async_refactoring_workflow(client: Client):
+# Context files never change between runs, so build them once at import
+_ASYNC_TURN1_CONTEXT_FILES = [
+    make_context_file("app/database/users.py", 0.95, "vecdb"),
+    make_context_file("app/database/connection.py", 0.88, "ast"),
+    make_context_file("docs/async_guide.md", 0.75, "vecdb")
+]
+_ASYNC_TURN2_CONTEXT_FILES = [
+    make_context_file("app/database/users.py", 0.98, "vecdb"),
+    make_context_file("app/models/user.py", 0.85, "ast")
+]
+_ASYNC_TURN3_CONTEXT_FILES = [
+    make_context_file("app/database/users.py", 0.96, "vecdb"),
+    make_context_file("app/database/pool.py", 0.92, "ast"),
+    make_context_file("app/cache/redis_client.py", 0.85, "vecdb")
+]
+
+
+async def scenario_async_refactoring_workflow(client: Client, sem: Optional[asyncio.Semaphore] = None):
     """
     Multi-turn conversation: User refactors sync code to async/await
     
@@ -196,10 +319,11 @@ async def scenario_async_refactoring_workflow(client: Client):
     
     session_id = "async_refactor_001"
     chat_id = make_chat_id(session_id)
+    turns: List[Dict] = []
     
     # Turn 1: Initial question about async conversion
-    print("\n[Turn 1] User asks about async conversion...")
-    result = await client.call_tool("ingest_conversation", {
+    print_step("\n[Turn 1] User asks about async conversion...")
+    turns.append({
         "request_id": make_request_id("async"),
         "project_id": PROJECT_ID,
         "timestamp": make_timestamp(),
@@ -215,8 +339,7 @@ async def scenario_async_refactoring_workflow(client: Client):
                 "role": "user",
                 "content_summary": "How do I convert my synchronous database functions to async/await in Python?",
                 "content_hash": make_content_hash("async question 1"),
-                "total_tokens": 15,
-                "sequence": 0
+                "total_tokens": 15
             },
             {
                 "sequence": 1,
@@ -225,28 +348,20 @@ async def scenario_async_refactoring_workflow(client: Client):
                 "content_hash": make_content_hash("async answer 1"),
                 "prompt_tokens": 30,
                 "completion_tokens": 80,
-                "total_tokens": 110,
-                "sequence": 1
+                "total_tokens": 110
             }
         ],
-        "context_files": [
-            make_context_file("app/database/users.py", 0.95, "vecdb"),
-            make_context_file("app/database/connection.py", 0.88, "ast"),
-            make_context_file("docs/async_guide.md", 0.75, "vecdb")
-        ],
+        "context_files": _ASYNC_TURN1_CONTEXT_FILES,
         "tool_calls": [
             make_tool_call("read_file", "success", 245),
             make_tool_call("codebase_search", "success", 380)
         ],
         "code_changes": []
     })
-    print_result("Turn 1 ingested", "OK", 1)
-    
-    await asyncio.sleep(1)
     
     # Turn 2: User implements async conversion
-    print("\n[Turn 2] User implements async conversion...")
-    result = await client.call_tool("ingest_conversation", {
+    print_step("\n[Turn 2] User implements async conversion...")
+    turns.append({
         "request_id": make_request_id("async"),
         "project_id": PROJECT_ID,
         "timestamp": make_timestamp(),
@@ -262,8 +377,7 @@ async def scenario_async_refactoring_workflow(client: Client):
                 "role": "user",
                 "content_summary": "I've converted get_user() to async. Can you review the changes?",
                 "content_hash": make_content_hash("async question 2"),
-                "total_tokens": 12,
-                "sequence": 0
+                "total_tokens": 12
             },
             {
                 "sequence": 1,
@@ -272,14 +386,10 @@ async def scenario_async_refactoring_workflow(client: Client):
                 "content_hash": make_content_hash("async answer 2"),
                 "prompt_tokens": 50,
                 "completion_tokens": 100,
-                "total_tokens": 150,
-                "sequence": 1
+                "total_tokens": 150
             }
         ],
-        "context_files": [
-            make_context_file("app/database/users.py", 0.98, "vecdb"),
-            make_context_file("app/models/user.py", 0.85, "ast")
-        ],
+        "context_files": _ASYNC_TURN2_CONTEXT_FILES,
         "tool_calls": [
             make_tool_call("read_file", "success", 220),
             make_tool_call("edit_file", "success", 450)
@@ -296,13 +406,10 @@ async def scenario_async_refactoring_workflow(client: Client):
             )
         ]
     })
-    print_result("Turn 2 ingested", "OK", 1)
-    
-    await asyncio.sleep(1)
     
     # Turn 3: Performance optimization
-    print("\n[Turn 3] Performance optimization discussion...")
-    result = await client.call_tool("ingest_conversation", {
+    print_step("\n[Turn 3] Performance optimization discussion...")
+    turns.append({
         "request_id": make_request_id("async"),
         "project_id": PROJECT_ID,
         "timestamp": make_timestamp(),
@@ -318,8 +425,7 @@ async def scenario_async_refactoring_workflow(client: Client):
                 "role": "user",
                 "content_summary": "The async version is working but still feels slow. How can I optimize it further?",
                 "content_hash": make_content_hash("async question 3"),
-                "total_tokens": 18,
-                "sequence": 0
+                "total_tokens": 18
             },
             {
                 "sequence": 1,
@@ -328,15 +434,10 @@ async def scenario_async_refactoring_workflow(client: Client):
                 "content_hash": make_content_hash("async answer 3"),
                 "prompt_tokens": 60,
                 "completion_tokens": 120,
-                "total_tokens": 180,
-                "sequence": 1
+                "total_tokens": 180
             }
         ],
-        "context_files": [
-            make_context_file("app/database/users.py", 0.96, "vecdb"),
-            make_context_file("app/database/pool.py", 0.92, "ast"),
-            make_context_file("app/cache/redis_client.py", 0.85, "vecdb")
-        ],
+        "context_files": _ASYNC_TURN3_CONTEXT_FILES,
         "tool_calls": [
             make_tool_call("read_file", "success", 280),
             make_tool_call("edit_file", "success", 520)
@@ -353,10 +454,14 @@ async def scenario_async_refactoring_workflow(client: Client):
             )
         ]
     })
-    print_result("Turn 3 ingested", "OK", 1)
+    
+    # Turns are independent payloads; only the search depends on them
+    async with _burst(sem):
+        await asyncio.gather(*(client.call_tool("ingest_conversation", turn) for turn in turns))
+    print_result("Turns 1-3 ingested", "OK", 1)
     
     # Search for async-related memories
-    print("\n[Search] Retrieving async refactoring knowledge...")
+    print_step("\n[Search] Retrieving async refactoring knowledge...")
     search_result = await client.call_tool("search", {
         "query": "async await refactoring performance optimization",
         "group_id": PROJECT_ID,
@@ -373,7 +478,78 @@ async def scenario_async_refactoring_workflow(client: Client):
 # SCENARIO 2: BUG INVESTIGATION AND FIXING
 # =============================================================================
 
-async def scenario_bug_investigation_workflow(client: Client):
+# Messages and context files never change between runs, so build them once
+# at import; only IDs and timestamps are made per call
+_BUG_TURN1_MESSAGES = [
+    {
+        "sequence": 0,
+        "role": "user",
+        "content_summary": "Getting 'NoneType has no attribute encode' error in payment processing. Stack trace shows it's in payment/stripe.py line 67 when processing refunds.",
+        "content_hash": make_content_hash("bug report 1"),
+        "total_tokens": 30
+    },
+    {
+        "sequence": 1,
+        "role": "assistant",
+        "content_summary": "The error occurs because payment.customer_email can be None for guest checkouts. The code assumes all payments have customer emails. We need defensive programming with proper null checks before encoding.",
+        "content_hash": make_content_hash("bug analysis 1"),
+        "prompt_tokens": 60,
+        "completion_tokens": 95,
+        "total_tokens": 155
+    }
+]
+_BUG_TURN1_CONTEXT_FILES = [
+    make_context_file("payment/stripe.py", 0.98, "vecdb"),
+    make_context_file("payment/models.py", 0.92, "ast"),
+    make_context_file("tests/test_payments.py", 0.80, "vecdb")
+]
+_BUG_TURN2_MESSAGES = [
+    {
+        "sequence": 0,
+        "role": "user",
+        "content_summary": "I've added null check for customer_email. Does this look right?",
+        "content_hash": make_content_hash("bug question 2"),
+        "total_tokens": 15
+    },
+    {
+        "sequence": 1,
+        "role": "assistant",
+        "content_summary": "The fix looks good! Consider also: 1) Adding logging for None cases to track frequency, 2) Using fallback to transaction_id for tracking, 3) Adding a database migration to make customer_email nullable if not already",
+        "content_hash": make_content_hash("bug analysis 2"),
+        "prompt_tokens": 70,
+        "completion_tokens": 110,
+        "total_tokens": 180
+    }
+]
+_BUG_TURN2_CONTEXT_FILES = [
+    make_context_file("payment/stripe.py", 0.97, "vecdb"),
+    make_context_file("payment/logger.py", 0.85, "ast")
+]
+_BUG_TURN3_MESSAGES = [
+    {
+        "sequence": 0,
+        "role": "user",
+        "content_summary": "What tests should I add to prevent this bug from happening again?",
+        "content_hash": make_content_hash("bug question 3"),
+        "total_tokens": 16
+    },
+    {
+        "sequence": 1,
+        "role": "assistant",
+        "content_summary": "Add these test cases: 1) test_refund_with_null_email() - verify refund works without customer email, 2) test_refund_logging_for_null_email() - verify proper logging, 3) test_guest_checkout_refund() - end-to-end test for guest users",
+        "content_hash": make_content_hash("bug analysis 3"),
+        "prompt_tokens": 80,
+        "completion_tokens": 120,
+        "total_tokens": 200
+    }
+]
+_BUG_TURN3_CONTEXT_FILES = [
+    make_context_file("tests/test_payments.py", 0.96, "vecdb"),
+    make_context_file("payment/stripe.py", 0.90, "ast")
+]
+
+
+async def scenario_bug_investigation_workflow(client: Client, sem: Optional[asyncio.Semaphore] = None):
     """
     Debugging session: User investigates and fixes a production bug
     
@@ -390,55 +566,35 @@ async def scenario_bug_investigation_workflow(client: Client):
     chat_id = make_chat_id(session_id)
     
     # Turn 1: Bug report with stack trace
-    print("\n[Turn 1] User reports production bug...")
-    result = await client.call_tool("ingest_conversation", {
-        "request_id": make_request_id("bug"),
-        "project_id": PROJECT_ID,
-        "timestamp": make_timestamp(),
-        "chat_meta": {
-            "chat_id": chat_id,
-            "base_chat_id": session_id,
-            "request_attempt_id": make_request_id("attempt"),
-            "chat_mode": "AGENT"
-        },
-        "messages": [
-            {
-                "sequence": 0,
-                "role": "user",
-                "content_summary": "Getting 'NoneType has no attribute encode' error in payment processing. Stack trace shows it's in payment/stripe.py line 67 when processing refunds.",
-                "content_hash": make_content_hash("bug report 1"),
-                "total_tokens": 30,
-                "sequence": 0
+    print_step("\n[Turn 1] User reports production bug...")
+    async with _burst(sem):
+        result = await client.call_tool("ingest_conversation", {
+            "request_id": make_request_id("bug"),
+            "project_id": PROJECT_ID,
+            "timestamp": make_timestamp(),
+            "chat_meta": {
+                "chat_id": chat_id,
+                "base_chat_id": session_id,
+                "request_attempt_id": make_request_id("attempt"),
+                "chat_mode": "AGENT"
             },
-            {
-                "sequence": 1,
-                "role": "assistant",
-                "content_summary": "The error occurs because payment.customer_email can be None for guest checkouts. The code assumes all payments have customer emails. We need defensive programming with proper null checks before encoding.",
-                "content_hash": make_content_hash("bug analysis 1"),
-                "prompt_tokens": 60,
-                "completion_tokens": 95,
-                "total_tokens": 155,
-                "sequence": 1
-            }
-        ],
-        "context_files": [
-            make_context_file("payment/stripe.py", 0.98, "vecdb"),
-            make_context_file("payment/models.py", 0.92, "ast"),
-            make_context_file("tests/test_payments.py", 0.80, "vecdb")
-        ],
-        "tool_calls": [
-            make_tool_call("read_file", "success", 310),
-            make_tool_call("codebase_search", "success", 420)
-        ],
-        "code_changes": []
-    })
+            "messages": _BUG_TURN1_MESSAGES,
+            "context_files": _BUG_TURN1_CONTEXT_FILES,
+            "tool_calls": [
+                make_tool_call("read_file", "success", 310),
+                make_tool_call("codebase_search", "success", 420)
+            ],
+            "code_changes": []
+        })
     print_result("Turn 1 ingested", "OK", 1)
     
-    await asyncio.sleep(1)
+    # Turns 2-3 build on the bug report but not on each other, so they go
+    # out together once turn 1 is in
+    turns: List[Dict] = []
     
     # Turn 2: Implement fix
-    print("\n[Turn 2] User implements defensive fix...")
-    result = await client.call_tool("ingest_conversation", {
+    print_step("\n[Turn 2] User implements defensive fix...")
+    turns.append({
         "request_id": make_request_id("bug"),
         "project_id": PROJECT_ID,
         "timestamp": make_timestamp(),
@@ -448,30 +604,8 @@ async def scenario_bug_investigation_workflow(client: Client):
             "request_attempt_id": make_request_id("attempt"),
             "chat_mode": "AGENT"
         },
-        "messages": [
-            {
-                "sequence": 0,
-                "role": "user",
-                "content_summary": "I've added null check for customer_email. Does this look right?",
-                "content_hash": make_content_hash("bug question 2"),
-                "total_tokens": 15,
-                "sequence": 0
-            },
-            {
-                "sequence": 1,
-                "role": "assistant",
-                "content_summary": "The fix looks good! Consider also: 1) Adding logging for None cases to track frequency, 2) Using fallback to transaction_id for tracking, 3) Adding a database migration to make customer_email nullable if not already",
-                "content_hash": make_content_hash("bug analysis 2"),
-                "prompt_tokens": 70,
-                "completion_tokens": 110,
-                "total_tokens": 180,
-                "sequence": 1
-            }
-        ],
-        "context_files": [
-            make_context_file("payment/stripe.py", 0.97, "vecdb"),
-            make_context_file("payment/logger.py", 0.85, "ast")
-        ],
+        "messages": _BUG_TURN2_MESSAGES,
+        "context_files": _BUG_TURN2_CONTEXT_FILES,
         "tool_calls": [
             make_tool_call("read_file", "success", 250),
             make_tool_call("edit_file", "success", 380)
@@ -488,13 +622,10 @@ async def scenario_bug_investigation_workflow(client: Client):
             )
         ]
     })
-    print_result("Turn 2 ingested", "OK", 1)
-    
-    await asyncio.sleep(1)
     
     # Turn 3: Add regression tests
-    print("\n[Turn 3] Adding regression tests...")
-    result = await client.call_tool("ingest_conversation", {
+    print_step("\n[Turn 3] Adding regression tests...")
+    turns.append({
         "request_id": make_request_id("bug"),
         "project_id": PROJECT_ID,
         "timestamp": make_timestamp(),
@@ -504,30 +635,8 @@ async def scenario_bug_investigation_workflow(client: Client):
             "request_attempt_id": make_request_id("attempt"),
             "chat_mode": "AGENT"
         },
-        "messages": [
-            {
-                "sequence": 0,
-                "role": "user",
-                "content_summary": "What tests should I add to prevent this bug from happening again?",
-                "content_hash": make_content_hash("bug question 3"),
-                "total_tokens": 16,
-                "sequence": 0
-            },
-            {
-                "sequence": 1,
-                "role": "assistant",
-                "content_summary": "Add these test cases: 1) test_refund_with_null_email() - verify refund works without customer email, 2) test_refund_logging_for_null_email() - verify proper logging, 3) test_guest_checkout_refund() - end-to-end test for guest users",
-                "content_hash": make_content_hash("bug analysis 3"),
-                "prompt_tokens": 80,
-                "completion_tokens": 120,
-                "total_tokens": 200,
-                "sequence": 1
-            }
-        ],
-        "context_files": [
-            make_context_file("tests/test_payments.py", 0.96, "vecdb"),
-            make_context_file("payment/stripe.py", 0.90, "ast")
-        ],
+        "messages": _BUG_TURN3_MESSAGES,
+        "context_files": _BUG_TURN3_CONTEXT_FILES,
         "tool_calls": [
             make_tool_call("read_file", "success", 290),
             make_tool_call("edit_file", "success", 520),
@@ -545,10 +654,13 @@ async def scenario_bug_investigation_workflow(client: Client):
             )
         ]
     })
-    print_result("Turn 3 ingested", "OK", 1)
+    
+    async with _burst(sem):
+        await asyncio.gather(*(client.call_tool("ingest_conversation", turn) for turn in turns))
+    print_result("Turns 2-3 ingested", "OK", 1)
     
     # Search for similar bug fixes
-    print("\n[Search] Finding similar null pointer fixes...")
+    print_step("\n[Search] Finding similar null pointer fixes...")
     search_result = await client.call_tool("search", {
         "query": "null pointer defensive programming error handling",
         "group_id": PROJECT_ID,
@@ -565,7 +677,7 @@ async def scenario_bug_investigation_workflow(client: Client):
 # SCENARIO 3: FEATURE IMPLEMENTATION WITH ITERATIONS
 # =============================================================================
 
-async def scenario_feature_implementation_workflow(client: Client):
+async def scenario_feature_implementation_workflow(client: Client, sem: Optional[asyncio.Semaphore] = None):
     """
     Feature development: User implements new API endpoint with iterations
     
@@ -582,133 +694,128 @@ async def scenario_feature_implementation_workflow(client: Client):
     session_id = "feature_api_001"
     chat_id = make_chat_id(session_id)
     
-    # Turn 1: Feature requirements
-    print("\n[Turn 1] User describes feature requirements...")
-    result = await client.call_tool("ingest_conversation", {
-        "request_id": make_request_id("feature"),
-        "project_id": PROJECT_ID,
-        "timestamp": make_timestamp(),
-        "chat_meta": {
-            "chat_id": chat_id,
-            "base_chat_id": session_id,
-            "request_attempt_id": make_request_id("attempt"),
-            "chat_mode": "AGENT"
-        },
-        "messages": [
-            {
-                "sequence": 0,
-                "role": "user",
-                "content_summary": "I need to add a REST API endpoint for bulk user updates. It should accept a list of user IDs and update fields, validate permissions, and return update status for each user.",
-                "content_hash": make_content_hash("feature req 1"),
-                "total_tokens": 40,
-                "sequence": 0
+    async with _burst(sem):
+        # Turn 1: Feature requirements
+        print_step("\n[Turn 1] User describes feature requirements...")
+        turn1 = await _start(client.call_tool("ingest_conversation", {
+            "request_id": make_request_id("feature"),
+            "project_id": PROJECT_ID,
+            "timestamp": make_timestamp(),
+            "chat_meta": {
+                "chat_id": chat_id,
+                "base_chat_id": session_id,
+                "request_attempt_id": make_request_id("attempt"),
+                "chat_mode": "AGENT"
             },
-            {
-                "sequence": 1,
-                "role": "assistant",
-                "content_summary": "Implementation plan: 1) Create POST /api/v1/users/bulk-update endpoint, 2) Add Pydantic model for validation (user_ids: List[int], updates: Dict), 3) Implement permission checks (admin or self-update only), 4) Use asyncio.gather() for parallel updates, 5) Return BulkUpdateResponse with success/failure for each user",
-                "content_hash": make_content_hash("feature plan 1"),
-                "prompt_tokens": 80,
-                "completion_tokens": 150,
-                "total_tokens": 230,
-                "sequence": 1
+            "messages": [
+                {
+                    "sequence": 0,
+                    "role": "user",
+                    "content_summary": "I need to add a REST API endpoint for bulk user updates. It should accept a list of user IDs and update fields, validate permissions, and return update status for each user.",
+                    "content_hash": make_content_hash("feature req 1"),
+                    "total_tokens": 40
+                },
+                {
+                    "sequence": 1,
+                    "role": "assistant",
+                    "content_summary": "Implementation plan: 1) Create POST /api/v1/users/bulk-update endpoint, 2) Add Pydantic model for validation (user_ids: List[int], updates: Dict), 3) Implement permission checks (admin or self-update only), 4) Use asyncio.gather() for parallel updates, 5) Return BulkUpdateResponse with success/failure for each user",
+                    "content_hash": make_content_hash("feature plan 1"),
+                    "prompt_tokens": 80,
+                    "completion_tokens": 150,
+                    "total_tokens": 230
+                }
+            ],
+            "context_files": [
+                make_context_file("api/v1/users.py", 0.95, "vecdb"),
+                make_context_file("api/models/user.py", 0.90, "ast"),
+                make_context_file("api/middleware/auth.py", 0.85, "vecdb")
+            ],
+            "tool_calls": [
+                make_tool_call("read_file", "success", 320),
+                make_tool_call("codebase_search", "success", 450)
+            ],
+            "code_changes": []
+        }))
+        
+        # Turn 2: Basic implementation
+        print_step("\n[Turn 2] User implements basic version...")
+        turn2 = await _start(client.call_tool("ingest_code_context", {
+            "project_id": PROJECT_ID,
+            "name": "Add bulk user update endpoint",
+            "summary": "Implemented POST /api/v1/users/bulk-update with basic validation and parallel processing",
+            "reference_time": make_timestamp(),
+            "metadata": {
+                "file_path": "api/v1/users.py",
+                "function_name": "bulk_update_users",
+                "change_type": "added",
+                "change_summary": "Added new endpoint with validation, rate limiting, and parallel processing support",
+                "severity": "high",
+                "lines_added": 85,
+                "lines_removed": 0,
+                "language": "python",
+                "timestamp": make_timestamp()
             }
-        ],
-        "context_files": [
-            make_context_file("api/v1/users.py", 0.95, "vecdb"),
-            make_context_file("api/models/user.py", 0.90, "ast"),
-            make_context_file("api/middleware/auth.py", 0.85, "vecdb")
-        ],
-        "tool_calls": [
-            make_tool_call("read_file", "success", 320),
-            make_tool_call("codebase_search", "success", 450)
-        ],
-        "code_changes": []
-    })
-    print_result("Turn 1 ingested", "OK", 1)
-    
-    await asyncio.sleep(1)
-    
-    # Turn 2: Basic implementation
-    print("\n[Turn 2] User implements basic version...")
-    result = await client.call_tool("ingest_code_context", {
-        "project_id": PROJECT_ID,
-        "name": "Add bulk user update endpoint",
-        "summary": "Implemented POST /api/v1/users/bulk-update with basic validation and parallel processing",
-        "reference_time": make_timestamp(),
-        "metadata": {
-            "file_path": "api/v1/users.py",
-            "function_name": "bulk_update_users",
-            "change_type": "added",
-            "change_summary": "Added new endpoint with validation, rate limiting, and parallel processing support",
-            "severity": "high",
-            "lines_added": 85,
-            "lines_removed": 0,
-            "language": "python",
-            "timestamp": make_timestamp()
-        }
-    })
-    print_result("Code change ingested", "OK", 1)
-    
-    await asyncio.sleep(1)
-    
-    # Turn 3: Security and rate limiting
-    print("\n[Turn 3] Adding security features...")
-    result = await client.call_tool("ingest_conversation", {
-        "request_id": make_request_id("feature"),
-        "project_id": PROJECT_ID,
-        "timestamp": make_timestamp(),
-        "chat_meta": {
-            "chat_id": chat_id,
-            "base_chat_id": session_id,
-            "request_attempt_id": make_request_id("attempt"),
-            "chat_mode": "AGENT"
-        },
-        "messages": [
-            {
-                "sequence": 0,
-                "role": "user",
-                "content_summary": "The endpoint works! What security measures should I add?",
-                "content_hash": make_content_hash("feature security 1"),
-                "total_tokens": 14,
-                "sequence": 0
+        }))
+        
+        # Turn 3: Security and rate limiting
+        print_step("\n[Turn 3] Adding security features...")
+        turn3 = await _start(client.call_tool("ingest_conversation", {
+            "request_id": make_request_id("feature"),
+            "project_id": PROJECT_ID,
+            "timestamp": make_timestamp(),
+            "chat_meta": {
+                "chat_id": chat_id,
+                "base_chat_id": session_id,
+                "request_attempt_id": make_request_id("attempt"),
+                "chat_mode": "AGENT"
             },
-            {
-                "sequence": 1,
-                "role": "assistant",
-                "content_summary": "Critical security additions: 1) Rate limiting: max 10 bulk updates per minute per user, 2) Input sanitization: validate all update fields against whitelist, 3) Audit logging: log all bulk operations with user_id and timestamp, 4) Maximum batch size: limit to 100 users per request to prevent DoS, 5) Transaction rollback: if any update fails, rollback all changes",
-                "content_hash": make_content_hash("feature security answer 1"),
-                "prompt_tokens": 90,
-                "completion_tokens": 140,
-                "total_tokens": 230,
-                "sequence": 1
-            }
-        ],
-        "context_files": [
-            make_context_file("api/v1/users.py", 0.97, "vecdb"),
-            make_context_file("api/middleware/rate_limit.py", 0.92, "ast"),
-            make_context_file("api/middleware/audit.py", 0.88, "vecdb")
-        ],
-        "tool_calls": [
-            make_tool_call("read_file", "success", 340),
-            make_tool_call("edit_file", "success", 580)
-        ],
-        "code_changes": [
-            make_code_change(
-                "api/v1/users.py",
-                "Added rate limiting, input sanitization, audit logging, and transaction rollback for bulk user updates",
-                change_type="modified",
-                severity="critical",
-                lines_added=45,
-                lines_removed=10,
-                function_name="bulk_update_users"
-            )
-        ]
-    })
-    print_result("Turn 3 ingested", "OK", 1)
+            "messages": [
+                {
+                    "sequence": 0,
+                    "role": "user",
+                    "content_summary": "The endpoint works! What security measures should I add?",
+                    "content_hash": make_content_hash("feature security 1"),
+                    "total_tokens": 14
+                },
+                {
+                    "sequence": 1,
+                    "role": "assistant",
+                    "content_summary": "Critical security additions: 1) Rate limiting: max 10 bulk updates per minute per user, 2) Input sanitization: validate all update fields against whitelist, 3) Audit logging: log all bulk operations with user_id and timestamp, 4) Maximum batch size: limit to 100 users per request to prevent DoS, 5) Transaction rollback: if any update fails, rollback all changes",
+                    "content_hash": make_content_hash("feature security answer 1"),
+                    "prompt_tokens": 90,
+                    "completion_tokens": 140,
+                    "total_tokens": 230
+                }
+            ],
+            "context_files": [
+                make_context_file("api/v1/users.py", 0.97, "vecdb"),
+                make_context_file("api/middleware/rate_limit.py", 0.92, "ast"),
+                make_context_file("api/middleware/audit.py", 0.88, "vecdb")
+            ],
+            "tool_calls": [
+                make_tool_call("read_file", "success", 340),
+                make_tool_call("edit_file", "success", 580)
+            ],
+            "code_changes": [
+                make_code_change(
+                    "api/v1/users.py",
+                    "Added rate limiting, input sanitization, audit logging, and transaction rollback for bulk user updates",
+                    change_type="modified",
+                    severity="critical",
+                    lines_added=45,
+                    lines_removed=10,
+                    function_name="bulk_update_users"
+                )
+            ]
+        }))
+        
+        # Each ingest is in flight while the next payload is built; only the
+        # search needs them all to have landed
+        await _join(turn1, turn2, turn3)
+    print_result("Turns 1-3 ingested", "OK", 1)
     
     # Search for similar API implementations
-    print("\n[Search] Finding similar bulk operation patterns...")
+    print_step("\n[Search] Finding similar bulk operation patterns...")
     search_result = await client.call_tool("search", {
         "query": "bulk update API rate limiting security validation",
         "group_id": PROJECT_ID,
@@ -725,7 +832,7 @@ async def scenario_feature_implementation_workflow(client: Client):
 # SCENARIO 4: PERFORMANCE OPTIMIZATION SESSION
 # =============================================================================
 
-async def scenario_performance_optimization_workflow(client: Client):
+async def scenario_performance_optimization_workflow(client: Client, sem: Optional[asyncio.Semaphore] = None):
     """
     Performance tuning: User optimizes slow endpoint
     
@@ -742,145 +849,137 @@ async def scenario_performance_optimization_workflow(client: Client):
     session_id = "perf_opt_001"
     chat_id = make_chat_id(session_id)
     
-    # Turn 1: Performance problem report
-    print("\n[Turn 1] User reports performance issue...")
-    result = await client.call_tool("ingest_text", {
-        "text": "Dashboard endpoint /api/dashboard is taking 8-12 seconds to load. Users are complaining. The endpoint loads user data, recent activities, and statistics. Need to optimize urgently.",
-        "project_id": PROJECT_ID,
-        "name": "Performance Issue: Dashboard slow loading"
-    })
-    print_result("Text ingested", "OK", 1)
-    
-    await asyncio.sleep(1)
-    
-    # Turn 2: Profiling and analysis
-    print("\n[Turn 2] Profiling and bottleneck identification...")
-    result = await client.call_tool("ingest_conversation", {
-        "request_id": make_request_id("perf"),
-        "project_id": PROJECT_ID,
-        "timestamp": make_timestamp(),
-        "chat_meta": {
-            "chat_id": chat_id,
-            "base_chat_id": session_id,
-            "request_attempt_id": make_request_id("attempt"),
-            "chat_mode": "AGENT"
-        },
-        "messages": [
-            {
-                "sequence": 0,
-                "role": "user",
-                "content_summary": "I ran a profiler. The dashboard makes 250+ database queries! Most are N+1 queries loading related objects.",
-                "content_hash": make_content_hash("perf analysis 1"),
-                "total_tokens": 25,
-                "sequence": 0
+    async with _burst(sem):
+        # Turn 1: Performance problem report
+        print_step("\n[Turn 1] User reports performance issue...")
+        turn1 = await _start(client.call_tool("ingest_text", {
+            "text": "Dashboard endpoint /api/dashboard is taking 8-12 seconds to load. Users are complaining. The endpoint loads user data, recent activities, and statistics. Need to optimize urgently.",
+            "project_id": PROJECT_ID,
+            "name": "Performance Issue: Dashboard slow loading"
+        }))
+        
+        # Turn 2: Profiling and analysis
+        print_step("\n[Turn 2] Profiling and bottleneck identification...")
+        turn2 = await _start(client.call_tool("ingest_conversation", {
+            "request_id": make_request_id("perf"),
+            "project_id": PROJECT_ID,
+            "timestamp": make_timestamp(),
+            "chat_meta": {
+                "chat_id": chat_id,
+                "base_chat_id": session_id,
+                "request_attempt_id": make_request_id("attempt"),
+                "chat_mode": "AGENT"
             },
-            {
-                "sequence": 1,
-                "role": "assistant",
-                "content_summary": "Classic N+1 problem! Solution: 1) Use select_related() for ForeignKey relations (user profiles, teams), 2) Use prefetch_related() for ManyToMany (activities, tags), 3) Add composite indexes on (user_id, created_at), 4) Consider denormalization for statistics (store counts in user table)",
-                "content_hash": make_content_hash("perf solution 1"),
-                "prompt_tokens": 100,
-                "completion_tokens": 160,
-                "total_tokens": 260,
-                "sequence": 1
+            "messages": [
+                {
+                    "sequence": 0,
+                    "role": "user",
+                    "content_summary": "I ran a profiler. The dashboard makes 250+ database queries! Most are N+1 queries loading related objects.",
+                    "content_hash": make_content_hash("perf analysis 1"),
+                    "total_tokens": 25
+                },
+                {
+                    "sequence": 1,
+                    "role": "assistant",
+                    "content_summary": "Classic N+1 problem! Solution: 1) Use select_related() for ForeignKey relations (user profiles, teams), 2) Use prefetch_related() for ManyToMany (activities, tags), 3) Add composite indexes on (user_id, created_at), 4) Consider denormalization for statistics (store counts in user table)",
+                    "content_hash": make_content_hash("perf solution 1"),
+                    "prompt_tokens": 100,
+                    "completion_tokens": 160,
+                    "total_tokens": 260
+                }
+            ],
+            "context_files": [
+                make_context_file("api/dashboard.py", 0.98, "vecdb"),
+                make_context_file("models/user.py", 0.94, "ast"),
+                make_context_file("models/activity.py", 0.90, "ast")
+            ],
+            "tool_calls": [
+                make_tool_call("profile_code", "success", 8500),
+                make_tool_call("analyze_queries", "success", 1200)
+            ],
+            "code_changes": []
+        }))
+        
+        # Turn 3: Implementing optimizations
+        print_step("\n[Turn 3] Implementing query optimizations...")
+        turn3 = await _start(client.call_tool("ingest_code_context", {
+            "project_id": PROJECT_ID,
+            "name": "Optimize dashboard queries",
+            "summary": "Added select_related and prefetch_related to eliminate N+1 queries, reducing query count from 250+ to 8",
+            "reference_time": make_timestamp(),
+            "metadata": {
+                "file_path": "api/dashboard.py",
+                "function_name": "get_dashboard_data",
+                "change_type": "refactored",
+                "change_summary": "Response time improved from 8s to 450ms by optimizing database queries",
+                "severity": "critical",
+                "lines_added": 25,
+                "lines_removed": 35,
+                "language": "python",
+                "diff_summary": "Added select_related for user relationships, prefetch_related for nested queries",
+                "timestamp": make_timestamp()
             }
-        ],
-        "context_files": [
-            make_context_file("api/dashboard.py", 0.98, "vecdb"),
-            make_context_file("models/user.py", 0.94, "ast"),
-            make_context_file("models/activity.py", 0.90, "ast")
-        ],
-        "tool_calls": [
-            make_tool_call("profile_code", "success", 8500),
-            make_tool_call("analyze_queries", "success", 1200)
-        ],
-        "code_changes": []
-    })
-    print_result("Turn 2 ingested", "OK", 1)
-    
-    await asyncio.sleep(1)
-    
-    # Turn 3: Implementing optimizations
-    print("\n[Turn 3] Implementing query optimizations...")
-    result = await client.call_tool("ingest_code_context", {
-        "project_id": PROJECT_ID,
-        "name": "Optimize dashboard queries",
-        "summary": "Added select_related and prefetch_related to eliminate N+1 queries, reducing query count from 250+ to 8",
-        "reference_time": make_timestamp(),
-        "metadata": {
-            "file_path": "api/dashboard.py",
-            "function_name": "get_dashboard_data",
-            "change_type": "refactored",
-            "change_summary": "Response time improved from 8s to 450ms by optimizing database queries",
-            "severity": "critical",
-            "lines_added": 25,
-            "lines_removed": 35,
-            "language": "python",
-            "diff_summary": "Added select_related for user relationships, prefetch_related for nested queries",
-            "timestamp": make_timestamp()
-        }
-    })
-    print_result("Code change ingested", "OK", 1)
-    
-    await asyncio.sleep(1)
-    
-    # Turn 4: Adding caching layer
-    print("\n[Turn 4] Adding Redis caching...")
-    result = await client.call_tool("ingest_conversation", {
-        "request_id": make_request_id("perf"),
-        "project_id": PROJECT_ID,
-        "timestamp": make_timestamp(),
-        "chat_meta": {
-            "chat_id": chat_id,
-            "base_chat_id": session_id,
-            "request_attempt_id": make_request_id("attempt"),
-            "chat_mode": "AGENT"
-        },
-        "messages": [
-            {
-                "sequence": 0,
-                "role": "user",
-                "content_summary": "Queries are much faster! Should I add caching for further improvement?",
-                "content_hash": make_content_hash("perf caching 1"),
-                "total_tokens": 14,
-                "sequence": 0
+        }))
+        
+        # Turn 4: Adding caching layer
+        print_step("\n[Turn 4] Adding Redis caching...")
+        turn4 = await _start(client.call_tool("ingest_conversation", {
+            "request_id": make_request_id("perf"),
+            "project_id": PROJECT_ID,
+            "timestamp": make_timestamp(),
+            "chat_meta": {
+                "chat_id": chat_id,
+                "base_chat_id": session_id,
+                "request_attempt_id": make_request_id("attempt"),
+                "chat_mode": "AGENT"
             },
-            {
-                "sequence": 1,
-                "role": "assistant",
-                "content_summary": "Yes, add Redis caching: 1) Cache dashboard data with 5-minute TTL, 2) Use cache key pattern 'dashboard:{user_id}:{date}', 3) Implement cache invalidation on user data updates, 4) Add cache warming for active users during off-peak hours, 5) Monitor cache hit rate (aim for >80%)",
-                "content_hash": make_content_hash("perf caching answer 1"),
-                "prompt_tokens": 110,
-                "completion_tokens": 145,
-                "total_tokens": 255,
-                "sequence": 1
-            }
-        ],
-        "context_files": [
-            make_context_file("api/dashboard.py", 0.96, "vecdb"),
-            make_context_file("cache/redis_client.py", 0.92, "ast"),
-            make_context_file("cache/strategies.py", 0.85, "vecdb")
-        ],
-        "tool_calls": [
-            make_tool_call("read_file", "success", 310),
-            make_tool_call("edit_file", "success", 520)
-        ],
-        "code_changes": [
-            make_code_change(
-                "api/dashboard.py",
-                "Added Redis caching layer with 5-minute TTL and smart invalidation, reducing response time to 45ms for cached requests",
-                change_type="modified",
-                severity="high",
-                lines_added=35,
-                lines_removed=5,
-                function_name="get_dashboard_data"
-            )
-        ]
-    })
-    print_result("Turn 4 ingested", "OK", 1)
+            "messages": [
+                {
+                    "sequence": 0,
+                    "role": "user",
+                    "content_summary": "Queries are much faster! Should I add caching for further improvement?",
+                    "content_hash": make_content_hash("perf caching 1"),
+                    "total_tokens": 14
+                },
+                {
+                    "sequence": 1,
+                    "role": "assistant",
+                    "content_summary": "Yes, add Redis caching: 1) Cache dashboard data with 5-minute TTL, 2) Use cache key pattern 'dashboard:{user_id}:{date}', 3) Implement cache invalidation on user data updates, 4) Add cache warming for active users during off-peak hours, 5) Monitor cache hit rate (aim for >80%)",
+                    "content_hash": make_content_hash("perf caching answer 1"),
+                    "prompt_tokens": 110,
+                    "completion_tokens": 145,
+                    "total_tokens": 255
+                }
+            ],
+            "context_files": [
+                make_context_file("api/dashboard.py", 0.96, "vecdb"),
+                make_context_file("cache/redis_client.py", 0.92, "ast"),
+                make_context_file("cache/strategies.py", 0.85, "vecdb")
+            ],
+            "tool_calls": [
+                make_tool_call("read_file", "success", 310),
+                make_tool_call("edit_file", "success", 520)
+            ],
+            "code_changes": [
+                make_code_change(
+                    "api/dashboard.py",
+                    "Added Redis caching layer with 5-minute TTL and smart invalidation, reducing response time to 45ms for cached requests",
+                    change_type="modified",
+                    severity="high",
+                    lines_added=35,
+                    lines_removed=5,
+                    function_name="get_dashboard_data"
+                )
+            ]
+        }))
+        
+        # Each ingest is in flight while the next payload is built; only the
+        # search needs them all to have landed
+        await _join(turn1, turn2, turn3, turn4)
+    print_result("Turns 1-4 ingested", "OK", 1)
     
     # Search for performance optimization patterns
-    print("\n[Search] Finding similar N+1 optimization techniques...")
+    print_step("\n[Search] Finding similar N+1 optimization techniques...")
     search_result = await client.call_tool("search", {
         "query": "N+1 query optimization caching performance database",
         "group_id": PROJECT_ID,
@@ -897,7 +996,7 @@ async def scenario_performance_optimization_workflow(client: Client):
 # SCENARIO 5: CROSS-PROJECT KNOWLEDGE RETRIEVAL
 # =============================================================================
 
-async def scenario_cross_project_knowledge_retrieval(client: Client):
+async def scenario_cross_project_knowledge_retrieval(client: Client, sem: Optional[asyncio.Semaphore] = None):
     """
     Knowledge retrieval: User searches across multiple coding sessions
     
@@ -917,26 +1016,26 @@ async def scenario_cross_project_knowledge_retrieval(client: Client):
         ("database query optimization", "Search for database optimization examples")
     ]
     
-    search_results = {}
+    strategies = ("rrf", "mmr", "cross_encoder")
+    
+    # Every query/strategy pair is independent: run all searches at once
+    jobs = [(query, strategy) for query, _ in test_queries for strategy in strategies]
+    await asyncio.gather(*(
+        client.call_tool("search", {
+            "query": query,
+            "group_id": PROJECT_ID,
+            "limit": 3,
+            "rerank_strategy": strategy
+        })
+        for query, strategy in jobs
+    ))
     
     for query, description in test_queries:
-        print(f"\n[Query] {description}...")
+        print_step(f"\n[Query] {description}...")
         print_result("Query", f"'{query}'", 1)
         
-        # Try different search strategies
-        for strategy in ["rrf", "mmr", "cross_encoder"]:
-            result = await client.call_tool("search", {
-                "query": query,
-                "group_id": PROJECT_ID,
-                "limit": 3,
-                "rerank_strategy": strategy
-            })
-            
-            # Parse result (simplified)
-            result_text = result.content[0].text if result.content else "No results"
+        for strategy in strategies:
             print_result(f"Strategy {strategy}", f"Found results", 2)
-        
-        await asyncio.sleep(0.5)
     
     print_result("Scenario 5", "COMPLETED", 0)
     return {"status": "success", "queries": len(test_queries)}
@@ -946,7 +1045,7 @@ async def scenario_cross_project_knowledge_retrieval(client: Client):
 # SCENARIO 6: CONCURRENT REQUEST STRESS TEST
 # =============================================================================
 
-async def scenario_concurrent_request_stress_test(client: Client):
+async def scenario_concurrent_request_stress_test(client: Client, sem: Optional[asyncio.Semaphore] = None):
     """
     Stress testing: Multiple concurrent ingest and search operations
     
@@ -959,63 +1058,77 @@ async def scenario_concurrent_request_stress_test(client: Client):
     print_section("SCENARIO 6: Concurrent Request Stress Test")
     
     # Test 1: Concurrent ingestion
-    print("\n[Test 1] Concurrent text ingestion (10 parallel requests)...")
-    start_time = time.time()
+    # Progress is collected and emitted once at the end, so no output
+    # work happens inside the timed phases
+    log: List[str] = ["\n[Test 1] Concurrent text ingestion (10 parallel requests)..."]
+    stress_sem = asyncio.Semaphore(STRESS_CONCURRENCY)  # shared by both phases
     
-    tasks = []
-    for i in range(10):
-        task = client.call_tool("ingest_text", {
+    tasks = [
+        _bounded(client.call_tool("ingest_text", {
             "text": f"Concurrent test memory {i}: Testing parallel ingestion capabilities of FastMCP server under load. This simulates multiple users ingesting data simultaneously.",
             "project_id": PROJECT_ID,
             "name": f"Concurrent Test {i}"
-        })
-        tasks.append(task)
+        }), stress_sem)
+        for i in range(10)
+    ]
     
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    end_time = time.time()
+    async with _burst(sem):
+        # Timed once the burst slot is held, so queueing isn't counted
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        end_time = time.perf_counter()
     
-    success_count = sum(1 for r in results if not isinstance(r, Exception))
-    print_result("Requests completed", f"{success_count}/10", 1)
-    print_result("Total time", f"{end_time - start_time:.2f}s", 1)
-    print_result("Avg per request", f"{(end_time - start_time) / 10:.2f}s", 1)
+    ingest_success = sum(1 for r in results if not isinstance(r, Exception))
+    log.append(format_result("Requests completed", f"{ingest_success}/10", 1))
+    log.append(format_result("Total time", f"{end_time - start_time:.2f}s", 1))
+    log.append(format_result("Avg per request", f"{(end_time - start_time) / 10:.2f}s", 1))
     
     await asyncio.sleep(2)
     
     # Test 2: Concurrent searches
-    print("\n[Test 2] Concurrent searches (15 parallel queries)...")
-    start_time = time.time()
+    log.append("\n[Test 2] Concurrent searches (15 parallel queries)...")
+    start_time = time.perf_counter()
     
-    search_queries = [
+    search_queries = (
         "async performance",
         "database optimization",
         "security fixes",
         "API implementation",
         "error handling",
-    ] * 3  # 15 total queries
+    )
     
-    tasks = []
-    for query in search_queries:
-        task = client.call_tool("search", {
+    # One (read-only) payload per unique query, reused by each repeat
+    search_payloads = [
+        {
             "query": query,
             "group_id": PROJECT_ID,
             "limit": 3,
             "rerank_strategy": "rrf"
-        })
-        tasks.append(task)
+        }
+        for query in search_queries
+    ]
+    
+    # 15 total queries: the five above, cycled three times
+    tasks = [
+        _bounded(client.call_tool("search", payload), stress_sem)
+        for payload in itertools.islice(itertools.cycle(search_payloads), 15)
+    ]
     
     results = await asyncio.gather(*tasks, return_exceptions=True)
-    end_time = time.time()
+    end_time = time.perf_counter()
     
-    success_count = sum(1 for r in results if not isinstance(r, Exception))
-    print_result("Searches completed", f"{success_count}/15", 1)
-    print_result("Total time", f"{end_time - start_time:.2f}s", 1)
-    print_result("Avg per search", f"{(end_time - start_time) / 15:.2f}s", 1)
+    search_success = sum(1 for r in results if not isinstance(r, Exception))
+    log.append(format_result("Searches completed", f"{search_success}/15", 1))
+    log.append(format_result("Total time", f"{end_time - start_time:.2f}s", 1))
+    log.append(format_result("Avg per search", f"{(end_time - start_time) / 15:.2f}s", 1))
     
+    if VERBOSE:
+        _emit("\n".join(log) + "\n")
     print_result("Scenario 6", "COMPLETED", 0)
     return {
         "status": "success",
-        "ingest_success": success_count,
-        "search_success": success_count
+        "ingest_success": ingest_success,
+        "search_success": search_success
     }
 
 
@@ -1023,7 +1136,7 @@ async def scenario_concurrent_request_stress_test(client: Client):
 # SCENARIO 7: ADMIN AND MONITORING OPERATIONS
 # =============================================================================
 
-async def scenario_admin_monitoring_operations(client: Client):
+async def scenario_admin_monitoring_operations(client: Client, sem: Optional[asyncio.Semaphore] = None):
     """
     Admin operations: System health, statistics, and cache management
     
@@ -1037,46 +1150,27 @@ async def scenario_admin_monitoring_operations(client: Client):
     print_section("SCENARIO 7: Admin and Monitoring Operations")
     
     # NOTE: Admin POST tools are filtered out. Test resources instead.
-    print("\n[INFO] Admin POST endpoints (/cache/, /admin/, /langfuse/) are filtered")
-    print("       Testing read-only resource endpoints instead...\n")
-    
-    # Test 1: Read cache stats (resource - allowed)
-    print("\n[Test 1] Reading cache statistics...")
-    try:
-        result = await client.read_resource("resource://get_cache_stats")
-        print_result("Cache stats retrieved", "Success", 1)
-    except Exception as e:
-        print_result("Cache stats", f"Error: {str(e)[:50]}", 1)
-    
-    await asyncio.sleep(0.5)
-    
-    # Test 2: Check cache health (resource - allowed)
-    print("\n[Test 2] Checking cache health...")
-    try:
-        result = await client.read_resource("resource://cache_health")
-        print_result("Cache health checked", "Success", 1)
-    except Exception as e:
-        print_result("Cache health", f"Error: {str(e)[:50]}", 1)
-    
-    await asyncio.sleep(0.5)
-    
-    # Test 3: Get tool stats (resource - allowed)
-    print("\n[Test 3] Reading tool statistics...")
-    try:
-        result = await client.read_resource("resource://get_tool_stats")
-        print_result("Tool stats retrieved", "Success", 1)
-    except Exception as e:
-        print_result("Tool stats", f"Error: {str(e)[:50]}", 1)
-    
-    await asyncio.sleep(0.5)
-    
-    # Test 4: Check Langfuse health (resource - allowed)
-    print("\n[Test 4] Checking Langfuse status...")
-    try:
-        result = await client.read_resource("resource://langfuse_health")
-        print_result("Langfuse health checked", "Success", 1)
-    except Exception as e:
-        print_result("Langfuse health", f"Error: {str(e)[:50]}", 1)
+    print_step("\n[INFO] Admin POST endpoints (/cache/, /admin/, /langfuse/) are filtered")
+    print_step("       Testing read-only resource endpoints instead...\n")
+    
+    # Independent read-only resources (all allowed): read them all at once
+    checks = [
+        ("resource://get_cache_stats", "Reading cache statistics", "Cache stats retrieved", "Cache stats"),
+        ("resource://cache_health", "Checking cache health", "Cache health checked", "Cache health"),
+        ("resource://get_tool_stats", "Reading tool statistics", "Tool stats retrieved", "Tool stats"),
+        ("resource://langfuse_health", "Checking Langfuse status", "Langfuse health checked", "Langfuse health"),
+    ]
+    results = await asyncio.gather(
+        *(client.read_resource(uri) for uri, *_ in checks),
+        return_exceptions=True
+    )
+    
+    for i, ((uri, step, ok_label, err_label), result) in enumerate(zip(checks, results), 1):
+        print_step(f"\n[Test {i}] {step}...")
+        if isinstance(result, Exception):
+            print_result(err_label, f"Error: {str(result)[:50]}", 1)
+        else:
+            print_result(ok_label, "Success", 1)
     
     print_result("Scenario 7", "COMPLETED", 0)
     return {"status": "success", "operations": 4}
@@ -1086,74 +1180,82 @@ async def scenario_admin_monitoring_operations(client: Client):
 # MAIN TEST RUNNER
 # =============================================================================
 
-async def run_comprehensive_test_suite():
-    """Run all comprehensive test scenarios"""
+async def run_comprehensive_test_suite(client: Optional[Client] = None):
+    """
+    Run all comprehensive test scenarios
+    
+    Pass a connected `client` to reuse its session across repeated runs;
+    otherwise one is opened (and closed) for this run.
+    """
     print_section("FASTMCP COMPREHENSIVE TEST SUITE", "=")
     print(f"Project ID: {PROJECT_ID}")
     print(f"Server URL: {BASE_URL}")
     print(f"Total Scenarios: 7")
     print()
     
-    results = {}
-    start_time = time.time()
-    
-    async with Client(BASE_URL) as client:
-        # Scenario 1: Async Refactoring
-        try:
-            results["async_refactoring"] = await scenario_async_refactoring_workflow(client)
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"[ERROR] Scenario 1 failed: {e}")
-            results["async_refactoring"] = {"status": "failed", "error": str(e)}
-        
-        # Scenario 2: Bug Investigation
-        try:
-            results["bug_investigation"] = await scenario_bug_investigation_workflow(client)
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"[ERROR] Scenario 2 failed: {e}")
-            results["bug_investigation"] = {"status": "failed", "error": str(e)}
-        
-        # Scenario 3: Feature Implementation
-        try:
-            results["feature_implementation"] = await scenario_feature_implementation_workflow(client)
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"[ERROR] Scenario 3 failed: {e}")
-            results["feature_implementation"] = {"status": "failed", "error": str(e)}
-        
-        # Scenario 4: Performance Optimization
-        try:
-            results["performance_optimization"] = await scenario_performance_optimization_workflow(client)
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"[ERROR] Scenario 4 failed: {e}")
-            results["performance_optimization"] = {"status": "failed", "error": str(e)}
-        
-        # Scenario 5: Cross-Project Knowledge
-        try:
-            results["knowledge_retrieval"] = await scenario_cross_project_knowledge_retrieval(client)
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"[ERROR] Scenario 5 failed: {e}")
-            results["knowledge_retrieval"] = {"status": "failed", "error": str(e)}
-        
-        # Scenario 6: Stress Test
-        try:
-            results["stress_test"] = await scenario_concurrent_request_stress_test(client)
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"[ERROR] Scenario 6 failed: {e}")
-            results["stress_test"] = {"status": "failed", "error": str(e)}
+    started_at = datetime.now(_UTC)  # run timestamp for the results file
+    start_time = time.perf_counter()
+    
+    scenarios = [
+        ("async_refactoring", scenario_async_refactoring_workflow),
+        ("bug_investigation", scenario_bug_investigation_workflow),
+        ("feature_implementation", scenario_feature_implementation_workflow),
+        ("performance_optimization", scenario_performance_optimization_workflow),
+        ("knowledge_retrieval", scenario_cross_project_knowledge_retrieval),
+        ("stress_test", scenario_concurrent_request_stress_test),
+        ("admin_operations", scenario_admin_monitoring_operations),
+    ]
+    sem = asyncio.Semaphore(SCENARIO_CONCURRENCY)
+    
+    session = contextlib.nullcontext(client) if client is not None else make_client(BASE_URL)
+    async with session as client:
+        # The MCP session fetches tools/list on the first call to any tool
+        # whose output schema it hasn't seen; warm that cache once up front
+        # instead of letting concurrent first calls each trigger a listing
+        await client.list_tools()
         
-        # Scenario 7: Admin Operations
-        try:
-            results["admin_operations"] = await scenario_admin_monitoring_operations(client)
-        except Exception as e:
-            print(f"[ERROR] Scenario 7 failed: {e}")
-            results["admin_operations"] = {"status": "failed", "error": str(e)}
-    
-    end_time = time.time()
+        # Each result is also written (one JSON line, line-buffered) as soon
+        # as its scenario finishes, so a crash mid-run keeps the rest; the
+        # file is truncated first so it only ever holds the current run
+        with open(PROGRESS_FILE, "w", buffering=1, encoding="utf-8") as progress:
+            # Scenarios use distinct sessions/chat IDs, so they all start at once
+            # on the one shared client; sem only gates their ingestion bursts
+            async def run(index: int, name: str, scenario) -> tuple:
+                # run() is its own task, so this buffer is only this scenario's
+                # (tasks the scenario spawns inherit it)
+                output: List[str] = []
+                _OUTPUT.set(output)
+                error = None
+                try:
+                    # A scenario that hangs is cancelled rather than stalling the suite
+                    result = await asyncio.wait_for(scenario(client, sem=sem), SCENARIO_TIMEOUT)
+                except asyncio.TimeoutError:
+                    error = f"timed out after {SCENARIO_TIMEOUT:g}s"
+                except Exception as e:
+                    error = str(e)
+                sys.stdout.write("".join(output))
+                if error is not None:
+                    print(f"[ERROR] Scenario {index} failed: {error}")
+                    result = {"status": "failed", "error": error}
+                
+                progress.write(orjson.dumps({
+                    "timestamp": started_at,
+                    "scenario": name,
+                    "result": result
+                }).decode() + "\n")
+                return name, result
+            
+            runs = [run(i, name, scenario) for i, (name, scenario) in enumerate(scenarios, 1)]
+            
+            # Both keep scenario order in the results; run() never raises
+            if sys.version_info >= (3, 11):
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(r) for r in runs]
+                results = dict(task.result() for task in tasks)
+            else:
+                results = dict(await asyncio.gather(*runs))
+    
+    end_time = time.perf_counter()
     total_time = end_time - start_time
     
     # Final Summary
@@ -1169,29 +1271,29 @@ async def run_comprehensive_test_suite():
         print(f"  {icon} {scenario.replace('_', ' ').title()}")
     
     print(f"\nOverall:")
-    print_result("Total scenarios", total_count, 1)
-    print_result("Successful", success_count, 1)
-    print_result("Failed", total_count - success_count, 1)
-    print_result("Success rate", f"{(success_count/total_count*100):.1f}%", 1)
-    print_result("Total time", f"{total_time:.2f}s", 1)
+    print(format_result("Total scenarios", total_count, 1))
+    print(format_result("Successful", success_count, 1))
+    print(format_result("Failed", total_count - success_count, 1))
+    print(format_result("Success rate", f"{(success_count/total_count*100):.1f}%", 1))
+    print(format_result("Total time", f"{total_time:.2f}s", 1))
     
     # Save detailed results to JSON
-    output_file = Path(__file__).parent / "comprehensive_test_results.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            "timestamp": datetime.utcnow().isoformat(),
-            "project_id": PROJECT_ID,
-            "total_time": total_time,
-            "results": results,
-            "summary": {
-                "total": total_count,
-                "success": success_count,
-                "failed": total_count - success_count,
-                "success_rate": f"{(success_count/total_count*100):.1f}%"
-            }
-        }, f, indent=2)
+    # (orjson writes datetimes natively, as ISO 8601)
+    RESULTS_FILE.write_bytes(orjson.dumps({
+        "timestamp": started_at,
+        "project_id": PROJECT_ID,
+        "total_time": total_time,
+        "results": results,
+        "summary": {
+            "total": total_count,
+            "success": success_count,
+            "failed": total_count - success_count,
+            "success_rate": f"{(success_count/total_count*100):.1f}%"
+        }
+    }, option=orjson.OPT_INDENT_2))
     
-    print(f"\nDetailed results saved to: {output_file}")
+    print(f"\nDetailed results saved to: {RESULTS_FILE}")
+    print(f"Per-scenario results written to: {PROGRESS_FILE}")
     
     return success_count == total_count
 
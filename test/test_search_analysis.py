@@ -7,16 +7,55 @@ Detailed analysis of search results from FastMCP Knowledge Graph
 """
 
 import asyncio
-import json
-from datetime import datetime
+import contextlib
+import hashlib
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import orjson
 from fastmcp import Client
 
+from client_factory import make_client
+
 BASE_URL = "http://localhost:8002/mcp"  # server_http.py runs on port 8002
 PROJECT_ID = "fastmcp_comprehensive_test"
+SEARCH_CONCURRENCY = 8  # max searches in flight at once
+
+# Result files, next to this module regardless of the working directory
+_TEST_DIR = Path(__file__).resolve().parent
+RESULTS_FILE = _TEST_DIR / "search_analysis_results.json"
+RESPONSES_DIR = _TEST_DIR / "search_analysis_responses"  # one file per response
+
+# "[OK]" status markers appear at the start of a response; don't scan past this
+OK_SCAN_CHARS = 4096
+
+# Checked once: non-UTF-8 consoles (e.g. Windows cp1252) get ASCII previews
+_STDOUT_UTF8 = (sys.stdout.encoding or "").lower().replace("-", "") == "utf8"
 
+# Per-query detail (previews, comparison tables); SEARCH_VERBOSE=0 keeps only
+# the overall summary. Defaults to on for an interactive terminal, off when
+# piped or under CI
+_INTERACTIVE = sys.stdout.isatty() and not os.getenv("CI")
+VERBOSE = os.getenv("SEARCH_VERBOSE", "1" if _INTERACTIVE else "0") == "1"
 
-async def analyze_search_quality():
-    """Analyze search results quality from knowledge graph"""
+
+def print_step(*args):
+    """Print a per-query detail line (skipped unless VERBOSE)"""
+    if VERBOSE:
+        print(*args)
+
+
+async def analyze_search_quality(client: Optional[Client] = None):
+    """
+    Analyze search results quality from knowledge graph
+    
+    Pass a connected `client` to reuse its session (e.g. when called
+    repeatedly or after the comprehensive suite); otherwise one is opened.
+    """
+    started_at = datetime.now(timezone.utc)  # run timestamp for the results file
     
     print("="*80)
     print("KNOWLEDGE GRAPH SEARCH ANALYSIS")
@@ -24,7 +63,8 @@ async def analyze_search_quality():
     print(f"Project ID: {PROJECT_ID}")
     print(f"Server URL: {BASE_URL}\n")
     
-    async with Client(BASE_URL) as client:
+    session = contextlib.nullcontext(client) if client is not None else make_client(BASE_URL)
+    async with session as client:
         
         # Test queries based on ingested data
         test_queries = [
@@ -55,96 +95,134 @@ async def analyze_search_quality():
             }
         ]
         
+        # Test each reranking strategy
+        strategies = ["rrf", "mmr", "cross_encoder"]
+        
+        # Every query/strategy search is independent: run them all at once,
+        # capped by a semaphore, and print once they have all returned
+        sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
+        
+        # Call arguments built once per (query, strategy); a pair that
+        # repeats shares a single search
+        payloads = {
+            (test_case["query"], strategy): {
+                "query": test_case["query"],
+                "group_id": PROJECT_ID,  # Correct parameter name
+                "limit": 5,
+                "rerank_strategy": strategy
+            }
+            for test_case in test_queries for strategy in strategies
+        }
+        
+        async def bounded_search(payload: dict):
+            async with sem:
+                return await client.call_tool("search", payload)
+        
+        responses = dict(zip(payloads, await asyncio.gather(
+            *(bounded_search(payload) for payload in payloads.values()),
+            return_exceptions=True
+        )))
+        
+        # Full response texts are written to one file each, next to the
+        # results file; entries keep only their path, hash and length.
+        # Files from a previous run are cleared so only this run's remain
+        RESPONSES_DIR.mkdir(exist_ok=True)
+        for stale in RESPONSES_DIR.glob("*.txt"):
+            stale.unlink()
+        
         all_results = []
         
         for idx, test_case in enumerate(test_queries, 1):
-            print(f"\n{'='*80}")
-            print(f"QUERY {idx}: {test_case['description']}")
-            print(f"{'='*80}")
-            print(f"Search Query: '{test_case['query']}'")
-            print(f"Expected Context: {test_case['expected_context']}")
-            print()
+            print_step(f"\n{'='*80}")
+            print_step(f"QUERY {idx}: {test_case['description']}")
+            print_step(f"{'='*80}")
+            print_step(f"Search Query: '{test_case['query']}'")
+            print_step(f"Expected Context: {test_case['expected_context']}")
+            print_step()
             
-            # Test each reranking strategy
-            strategies = ["rrf", "mmr", "cross_encoder"]
             strategy_results = {}
             
             for strategy in strategies:
-                print(f"\n--- Strategy: {strategy.upper()} ---")
+                print_step(f"\n--- Strategy: {strategy.upper()} ---")
+                result = responses[test_case["query"], strategy]
                 
-                try:
-                    result = await client.call_tool("search", {
-                        "query": test_case["query"],
-                        "group_id": PROJECT_ID,  # Correct parameter name
-                        "limit": 5,
-                        "rerank_strategy": strategy
-                    })
-                    
-                    # Extract text content
-                    if result.content and len(result.content) > 0:
-                        content_text = result.content[0].text
-                        
-                        # Parse and display results
-                        print(f"\nRaw Response Length: {len(content_text)} characters")
-                        
-                        # Try to extract structured information
-                        if "[OK]" in content_text:
-                            print("Status: [OK] Search successful")
-                        
-                        # Display preview (handle Unicode for Windows)
-                        preview = content_text[:500] if len(content_text) > 500 else content_text
-                        print(f"\nResponse Preview:")
-                        print("-" * 80)
-                        try:
-                            print(preview)
-                        except UnicodeEncodeError:
-                            # Fallback for Windows console
-                            print(preview.encode('ascii', 'replace').decode('ascii'))
-                        if len(content_text) > 500:
-                            print(f"\n... (truncated, {len(content_text) - 500} more characters)")
-                        print("-" * 80)
-                        
-                        strategy_results[strategy] = {
-                            "status": "success",
-                            "response_length": len(content_text),
-                            "content": content_text
-                        }
-                    else:
-                        print("Status: [WARNING] Empty response")
-                        strategy_results[strategy] = {
-                            "status": "empty",
-                            "response_length": 0,
-                            "content": ""
-                        }
-                        
-                except Exception as e:
-                    print(f"Status: [ERROR] {str(e)}")
+                if isinstance(result, Exception):
+                    print_step(f"Status: [ERROR] {str(result)}")
                     strategy_results[strategy] = {
                         "status": "error",
-                        "error": str(e)
+                        "error": str(result)
+                    }
+                elif result.content and len(result.content) > 0:
+                    # Extract text content
+                    content_text = result.content[0].text
+                    
+                    # Parse and display results
+                    n = len(content_text)
+                    print_step(f"\nRaw Response Length: {n} characters")
+                    
+                    # Try to extract structured information
+                    if content_text.find("[OK]", 0, OK_SCAN_CHARS) != -1:
+                        print_step("Status: [OK] Search successful")
+                    
+                    # Search responses are JSON ({"results": [...]}) when
+                    # the endpoint returns structured hits
+                    try:
+                        parsed = orjson.loads(content_text)
+                    except orjson.JSONDecodeError:
+                        parsed = None
+                    hits = parsed.get("results") if isinstance(parsed, dict) else None
+                    result_count = len(hits) if isinstance(hits, list) else None
+                    if result_count is not None:
+                        print_step(f"Results Returned: {result_count}")
+                    
+                    # Display preview (handle Unicode for Windows)
+                    preview = content_text[:500]
+                    if not _STDOUT_UTF8:
+                        preview = preview.encode('ascii', 'replace').decode('ascii')
+                    print_step(f"\nResponse Preview:")
+                    print_step("-" * 80)
+                    print_step(preview)
+                    if n > 500:
+                        print_step(f"\n... (truncated, {n - 500} more characters)")
+                    print_step("-" * 80)
+                    
+                    content_file = RESPONSES_DIR / f"q{idx}_{strategy}.txt"
+                    content_file.write_text(content_text, encoding="utf-8")
+                    
+                    strategy_results[strategy] = {
+                        "status": "success",
+                        "response_length": n,
+                        "result_count": result_count,
+                        "content_path": content_file.relative_to(RESULTS_FILE.parent).as_posix(),
+                        "content_sha256": hashlib.sha256(content_text.encode()).hexdigest()[:16]
+                    }
+                else:
+                    print_step("Status: [WARNING] Empty response")
+                    strategy_results[strategy] = {
+                        "status": "empty",
+                        "response_length": 0
                     }
             
             # Compare strategies
-            print(f"\n{'='*80}")
-            print(f"STRATEGY COMPARISON FOR QUERY {idx}")
-            print(f"{'='*80}")
+            print_step(f"\n{'='*80}")
+            print_step(f"STRATEGY COMPARISON FOR QUERY {idx}")
+            print_step(f"{'='*80}")
             
             for strategy, result in strategy_results.items():
                 status = result.get("status", "unknown")
                 if status == "success":
                     length = result.get("response_length", 0)
-                    print(f"{strategy.upper():15} - {status:10} - {length:5} chars")
+                    print_step(f"{strategy.upper():15} - {status:10} - {length:5} chars")
                 else:
-                    print(f"{strategy.upper():15} - {status:10}")
+                    print_step(f"{strategy.upper():15} - {status:10}")
             
-            all_results.append({
+            entry = {
                 "query": test_case["query"],
                 "description": test_case["description"],
                 "expected_context": test_case["expected_context"],
                 "results": strategy_results
-            })
-            
-            await asyncio.sleep(1)
+            }
+            all_results.append(entry)
         
         # Overall Summary
         print(f"\n\n{'='*80}")
@@ -176,28 +254,27 @@ async def analyze_search_quality():
             success_rate = (stats["success"] / stats["total"] * 100) if stats["total"] > 0 else 0
             print(f"  {strategy.upper():15} - {stats['success']}/{stats['total']} ({success_rate:.1f}%)")
         
-        # Save detailed results
-        output_file = "search_analysis_results.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "timestamp": datetime.utcnow().isoformat(),
-                "project_id": PROJECT_ID,
-                "total_queries": len(test_queries),
-                "total_searches": total_searches,
-                "successful_searches": successful_searches,
-                "success_rate": f"{(successful_searches/total_searches*100):.1f}%",
-                "strategy_stats": {
-                    strategy: {
-                        "success": stats["success"],
-                        "total": stats["total"],
-                        "success_rate": f"{(stats['success']/stats['total']*100):.1f}%"
-                    }
-                    for strategy, stats in strategy_stats.items()
-                },
-                "detailed_results": all_results
-            }, f, indent=2, ensure_ascii=False)
+        # Save results to file
+        # (orjson writes UTF-8 and datetimes natively, as ISO 8601)
+        RESULTS_FILE.write_bytes(orjson.dumps({
+            "timestamp": started_at,
+            "project_id": PROJECT_ID,
+            "total_queries": len(test_queries),
+            "total_searches": total_searches,
+            "successful_searches": successful_searches,
+            "success_rate": f"{(successful_searches/total_searches*100):.1f}%",
+            "strategy_stats": {
+                strategy: {
+                    "success": stats["success"],
+                    "total": stats["total"],
+                    "success_rate": f"{(stats['success']/stats['total']*100):.1f}%"
+                }
+                for strategy, stats in strategy_stats.items()
+            },
+            "detailed_results": all_results
+        }, option=orjson.OPT_INDENT_2))
         
-        print(f"\nDetailed results saved to: {output_file}")
+        print(f"\nDetailed results saved to: {RESULTS_FILE}")
         
         return all_results
 